@@ -0,0 +1,72 @@
+"""Measure the time of ``import compas_assembly2`` in fresh interpreters.
+
+The viewers, the element types and the optional dependencies are imported on the first use,
+the script fails if one of them is imported with the package or if the median time exceeds the limit.
+
+Usage::
+
+    python scripts/benchmark_import_time.py --runs 10 --limit 1500
+
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import subprocess
+import sys
+
+# modules that must not be imported by ``import compas_assembly2``
+LAZY_MODULES = [
+    "compas_assembly2.viewer",
+    "compas_assembly2.viewer_model",
+    "compas_assembly2.beam",
+    "compas_assembly2.block",
+    "compas_view2",
+    "shapely",
+]
+
+PROGRAM = """
+import json, sys, time
+start = time.perf_counter()
+import compas_assembly2
+stop = time.perf_counter()
+print(json.dumps({"time": (stop - start) * 1000.0, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure(runs):
+    """Import the package in ``runs`` new interpreters, returns the times in milliseconds and the loaded modules."""
+    times = []
+    modules = set()
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", PROGRAM])
+        result = json.loads(output.decode().strip().splitlines()[-1])
+        times.append(result["time"])
+        modules.update(result["modules"])
+    return times, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="number of fresh interpreters")
+    parser.add_argument("--limit", type=float, default=None, help="maximum median import time in milliseconds")
+    args = parser.parse_args()
+
+    times, modules = measure(args.runs)
+    times.sort()
+    median = times[len(times) // 2]
+    print("import compas_assembly2: median {:.1f} ms, min {:.1f} ms, max {:.1f} ms".format(median, times[0], times[-1]))
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in modules]
+    if eager:
+        print("imported eagerly: {}".format(", ".join(eager)))
+        failed = True
+    if args.limit is not None and median > args.limit:
+        print("median import time exceeds the limit of {:.1f} ms".format(args.limit))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
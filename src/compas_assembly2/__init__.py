@@ -29,6 +29,49 @@ Element class
 
     element.Element
 
+
+Spatial index
+=============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    spatial.BVH
+    spatial.SpatialHash
+
+
+Element storage
+===============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    store.ElementStore
+    store.ElementView
+
+
+Joints
+======
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    joint.Joint
+    joint.JointTable
+
+
+Graph queries
+=============
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    adjacency.InteractionAdjacency
+
 """
 
 from __future__ import print_function  # noqa: F401 E402 F403
@@ -121,11 +164,36 @@ global_geometry = []
 
 from .element import Element  # noqa: F401 E402 F403
 from .algorithms import Algorithms  # noqa: F401 E402 F403
+from .spatial import BVH, SpatialHash  # noqa: F401 E402 F403
+from .store import ElementStore, ElementView  # noqa: F401 E402 F403
+from .joint import Joint, JointTable  # noqa: F401 E402 F403
+from .adjacency import InteractionAdjacency  # noqa: F401 E402 F403
 from .model import Model, ElementTree, GroupNode, ElementNode  # noqa: F401 E402 F403
 
-from .viewer_model import ViewerModel  # noqa: F401 E402 F403
-from .viewer import Viewer  # noqa: F401 E402 F403
+# ==========================================================================
+# LAZY IMPORTS
+# the viewers probe compas_view2 and the element types pull in more of compas,
+# they are imported on the first attribute access, e.g. compas_assembly2.Viewer
+# ==========================================================================
+
+_lazy_attributes = {
+    "ViewerModel": "viewer_model",
+    "Viewer": "viewer",
+    "Block": "block",
+    "Beam": "beam",
+}
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        import importlib
+
+        module = importlib.import_module("." + _lazy_attributes[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
 
-# from .joint import Joint  # noqa: F401 E402 F403
-from .block import Block  # noqa: F401 E402 F403
-from .beam import Beam  # noqa: F401 E402 F403
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_attributes))
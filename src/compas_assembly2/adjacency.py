@@ -0,0 +1,213 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+# ==========================================================================
+# COMPRESSED SPARSE ADJACENCY OF THE INTERACTIONS
+# one row per graph node, the neighbours of the row ``i`` are ``indices[indptr[i]:indptr[i + 1]]``
+# ==========================================================================
+
+
+class InteractionAdjacency(object):
+    """A compressed sparse row snapshot of an interaction graph, for batch graph queries with SciPy.
+
+    The graph is read once into index and weight arrays, so shortest paths between many elements
+    are computed by :func:`scipy.sparse.csgraph.dijkstra` without converting the graph on every query.
+    The interactions are undirected, every edge is stored in the rows of both of its nodes.
+    Edges stored in both directions keep the smallest weight, edges without weight count as ``1.0``.
+
+    Parameters
+    ----------
+    graph : :class:`compas.datastructures.Graph`, optional
+        The interactions, the node keys are the element GUID strings.
+    weight : str, optional
+        The name of the edge attribute used as the length of the edges.
+
+    Attributes
+    ----------
+    keys : list[str]
+        The graph node keys, the order of the rows.
+    indptr : numpy.ndarray
+        An (n + 1,) integer array of the first neighbour of each row.
+    indices : numpy.ndarray
+        A (2m,) integer array of the neighbour rows.
+    weights : numpy.ndarray
+        A (2m,) float array of the edge lengths, in the order of ``indices``.
+
+    Examples
+    --------
+    >>> from compas.datastructures import Graph
+    >>> graph = Graph()
+    >>> for key in "abcd":
+    ...     _ = graph.add_node(key)
+    >>> _ = graph.add_edge("a", "b", {"weight": 1.0})
+    >>> _ = graph.add_edge("b", "c", {"weight": 1.0})
+    >>> _ = graph.add_edge("a", "c", {"weight": 5.0})
+    >>> adjacency = InteractionAdjacency(graph)
+    >>> len(adjacency), adjacency.neighbors("b")
+    (4, ['a', 'c'])
+    >>> adjacency.shortest_paths(["a", "c"], ["c", "d"])
+    [[['a', 'b', 'c'], None], [['c'], None]]
+    >>> adjacency.distances(["a"], ["c", "d"]).tolist()
+    [[2.0, inf]]
+
+    """
+
+    def __init__(self, graph=None, weight="weight"):
+        from numpy import zeros
+
+        self._index = {}
+        self._matrix = None
+        self.keys = []
+        self.indptr = zeros(1, dtype=int)
+        self.indices = zeros(0, dtype=int)
+        self.weights = zeros(0)
+
+        if graph is not None:
+            self._build(graph, weight)
+
+    def _build(self, graph, weight):
+        from numpy import asarray, bincount, concatenate, cumsum, lexsort
+
+        self.keys = list(graph.node)
+        index = self._index = {key: i for i, key in enumerate(self.keys)}
+        default = graph.default_edge_attributes.get(weight)
+
+        # --------------------------------------------------------------------------
+        # one length per node pair, self-loops do not shorten any path
+        # --------------------------------------------------------------------------
+        lengths = {}
+        for u, neighbours in graph.edge.items():
+            i = index[u]
+            for v, attributes in neighbours.items():
+                j = index[v]
+                if i == j:
+                    continue
+                length = attributes.get(weight, default) if attributes else default
+                length = 1.0 if length is None else float(length)
+                pair = (i, j) if i < j else (j, i)
+                if pair not in lengths or length < lengths[pair]:
+                    lengths[pair] = length
+
+        # --------------------------------------------------------------------------
+        # both directions of every pair, sorted by row and column
+        # --------------------------------------------------------------------------
+        pairs = asarray(list(lengths.keys()), dtype=int).reshape(-1, 2)
+        values = asarray(list(lengths.values()), dtype=float)
+        rows = concatenate([pairs[:, 0], pairs[:, 1]])
+        columns = concatenate([pairs[:, 1], pairs[:, 0]])
+        order = lexsort((columns, rows))
+        self.indices = columns[order]
+        self.weights = concatenate([values, values])[order]
+        self.indptr = concatenate([[0], cumsum(bincount(rows, minlength=len(self.keys)))]).astype(int)
+
+    # ==========================================================================
+    # properties
+    # ==========================================================================
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return str(key) in self._index
+
+    def __repr__(self):
+        return "<InteractionAdjacency with {} nodes, {} edges>".format(len(self.keys), len(self.indices) // 2)
+
+    @property
+    def matrix(self):
+        """The (n, n) :class:`scipy.sparse.csr_matrix` of the edge lengths, built on the first use."""
+        if self._matrix is None:
+            from scipy.sparse import csr_matrix
+
+            n = len(self.keys)
+            self._matrix = csr_matrix((self.weights, self.indices, self.indptr), shape=(n, n))
+        return self._matrix
+
+    # ==========================================================================
+    # access
+    # ==========================================================================
+
+    def index(self, key):
+        """Get the row of a graph node by its key, an element or a GUID."""
+        key = key.guid if hasattr(key, "guid") else key
+        return self._index[str(key)]
+
+    def neighbors(self, key):
+        """Get the keys of the neighbours of a graph node."""
+        i = self.index(key)
+        return [self.keys[j] for j in self.indices[self.indptr[i] : self.indptr[i + 1]].tolist()]  # noqa: E203
+
+    # ==========================================================================
+    # shortest paths
+    # ==========================================================================
+
+    def distances(self, sources, targets=None):
+        """Get the lengths of the shortest paths from many sources to many targets in one Dijkstra run.
+
+        Parameters
+        ----------
+        sources : list
+            The source nodes, as keys, elements, or GUIDs.
+        targets : list, optional
+            The target nodes, all nodes if None.
+
+        Returns
+        -------
+        numpy.ndarray
+            An (s, t) float array of the path lengths, ``inf`` for unreachable targets.
+        """
+        from scipy.sparse.csgraph import dijkstra
+
+        rows = [self.index(key) for key in sources]
+        distances = dijkstra(self.matrix, directed=True, indices=rows)
+        if targets is None:
+            return distances
+        return distances[:, [self.index(key) for key in targets]]
+
+    def shortest_paths(self, sources, targets, chunk=256):
+        """Get the shortest paths from every source to every target.
+
+        The sources are processed in chunks, one Dijkstra run per chunk,
+        so the predecessor arrays stay within ``chunk`` times the number of nodes.
+
+        Parameters
+        ----------
+        sources : list
+            The source nodes, as keys, elements, or GUIDs.
+        targets : list
+            The target nodes, as keys, elements, or GUIDs.
+        chunk : int, optional
+            The number of sources per Dijkstra run.
+
+        Returns
+        -------
+        list[list[list[str] | None]]
+            For each source and each target, the keys of the nodes on the path, None for unreachable targets.
+        """
+        from scipy.sparse.csgraph import dijkstra
+
+        rows = [self.index(key) for key in sources]
+        columns = [self.index(key) for key in targets]
+        keys = self.keys
+        paths = []
+        for start in range(0, len(rows), chunk):
+            _, predecessors = dijkstra(
+                self.matrix, directed=True, indices=rows[start : start + chunk], return_predecessors=True  # noqa: E203
+            )
+            for row, source in zip(predecessors.tolist(), rows[start : start + chunk]):  # noqa: E203
+                source_paths = []
+                for target in columns:
+                    if target != source and row[target] < 0:
+                        source_paths.append(None)
+                        continue
+                    path = [target]
+                    while path[-1] != source:
+                        path.append(row[path[-1]])
+                    source_paths.append([keys[i] for i in reversed(path)])
+                paths.append(source_paths)
+        return paths
+
+    def shortest_path(self, source, target):
+        """Get the keys of the nodes on the shortest path between two nodes, or None if they are not connected."""
+        return self.shortest_paths([source], [target])[0][0]
@@ -1,22 +1,36 @@
 from compas.geometry import (
     Frame,
     Polygon,
-    Plane,
-    Transformation,
-    transform_points,
+    Vector,
+    bounding_box,
+    centroid_polygon,
+    cross_vectors,
     distance_point_point,
+    normal_polygon,
 )
 
 from compas.datastructures import Mesh
-from math import fabs
 
-try:
-    from shapely.geometry import Polygon as ShapelyPolygon
+from compas_assembly2.spatial import SpatialHash
+
+# shapely is imported on the first face-to-face detection, None until it is checked
+shapely_available = None
+
+
+def _check_shapely():
+    """import shapely on the first use, returns False with a warning if it is not installed"""
+    global shapely_available
+    if shapely_available is None:
+        try:
+            import shapely.geometry  # noqa: F401
+            import shapely.prepared  # noqa: F401
+
+            shapely_available = True
+        except ImportError:
+            print("shapely package not available. Please install it.")
+            shapely_available = False
+    return shapely_available
 
-    shapely_available = True
-except ImportError:
-    print("shapely package not available. Please install it.")
-    shapely_available = False
 
 # ==========================================================================
 # CHECK COLLISION
@@ -33,19 +47,264 @@ geometry = []
 polygons = []
 
 
+# ==========================================================================
+# FACE-TO-FACE DETECTION ON FACE TABLES
+# module-level functions, so they can be sent to other processes
+# ==========================================================================
+
+
+def _face_table(polygons):
+    """Pack the face polygons of a mesh in arrays, see Element.face_table.
+
+    The polygons are lists of XYZ coordinates, e.g. from ``Mesh.to_polygons``.
+    The face frames are computed as in Element.face_frames, the centroid, the normal and the first edge of the face.
+    """
+    from numpy import asarray, cumsum, einsum, maximum, minimum, zeros
+
+    # --------------------------------------------------------------------------
+    # pack the polygons and frames
+    # --------------------------------------------------------------------------
+    points = []
+    offsets = zeros(len(polygons) + 1, dtype=int)
+    frames = []
+    for id, xyz in enumerate(polygons):
+        points.extend(xyz)
+        offsets[id + 1] = len(xyz)
+        u = [xyz[1][i] - xyz[0][i] for i in range(3)]
+        frame = Frame(centroid_polygon(xyz), u, cross_vectors(normal_polygon(xyz), u))
+        frames.append([frame.point, frame.xaxis, frame.yaxis, frame.zaxis])
+    points = asarray(points, dtype=float).reshape(-1, 3)
+    offsets = cumsum(offsets)
+    frames = asarray(frames, dtype=float).reshape(-1, 4, 3)
+
+    # --------------------------------------------------------------------------
+    # planes and the 2D bounds of each face in its own frame
+    # --------------------------------------------------------------------------
+    planes = einsum("ij,ij->i", frames[:, 3], frames[:, 0])
+    bounds = zeros((len(frames), 4))
+    local = zeros((len(points), 3))
+    if len(points):
+        face_of_point = offsets[1:].searchsorted(range(len(points)), side="right")
+        local = einsum("ij,ikj->ik", points - frames[face_of_point, 0], frames[face_of_point, 1:])
+        bounds[:, :2] = minimum.reduceat(local[:, :2], offsets[:-1], axis=0)
+        bounds[:, 2:] = maximum.reduceat(local[:, :2], offsets[:-1], axis=0)
+
+    return {
+        "points": points,
+        "offsets": offsets,
+        "frames": frames,
+        "planes": planes,
+        "bounds": bounds,
+        "local": local,
+    }
+
+
+def _face_to_face_tables(
+    table0,
+    table1,
+    tmax=1e-2,
+    amin=1e1,
+    shapes0=None,
+    shapes1=None,
+    t_normal_colinearity=1e-1,
+    t_dist_frames=1e-1,
+    snap=None,
+):
+    """Intersect the coplanar faces of two face tables, see Element.face_table.
+
+    The shapes are the caches of the shapely face polygons in their own frames, see Element.face_shapes.
+    The face1 points closer than ``snap`` to a face0 point are moved onto it, None uses ``tmax * 1e-3``.
+    Returns a list of [(id_0, id_1), points], where the points of the interface polygon are in world coordinates.
+    """
+    from numpy import abs, cross, dot, einsum, linalg
+
+    offsets0, frames0 = table0["offsets"], table0["frames"]
+    offsets1, frames1 = table1["offsets"], table1["frames"]
+    shapes0 = {} if shapes0 is None else shapes0
+    shapes1 = {} if shapes1 is None else shapes1
+    snap = tmax * 1e-3 if snap is None else snap
+
+    # --------------------------------------------------------------------------
+    # candidate face pairs, all combinations at once
+    # parallel or anti-parallel normals and the origin of face1 on the plane of face0
+    # --------------------------------------------------------------------------
+    normals0, normals1 = frames0[:, 3], frames1[:, 3]
+    are_parallel = linalg.norm(cross(normals0[:, None], normals1[None, :]), axis=2) < t_normal_colinearity
+    distances = dot(normals0, frames1[:, 0].T) - table0["planes"][:, None]
+    are_close = abs(distances) < t_dist_frames
+
+    # the faces can only overlap if the discs around their 2D bounds overlap on the plane of face0
+    radii0 = _bounds_radius(table0["bounds"])
+    radii1 = _bounds_radius(table1["bounds"])
+    vectors = frames1[None, :, 0] - frames0[:, None, 0]
+    in_plane = vectors - distances[:, :, None] * normals0[:, None]
+    are_near = einsum("ijk,ijk->ij", in_plane, in_plane) <= (radii0[:, None] + radii1[None, :] + tmax) ** 2
+
+    candidates = (are_parallel & are_close & are_near).nonzero()
+    if len(candidates[0]) == 0:
+        return []
+
+    interfaces = []
+    shapely_polygon_0 = None
+    last_id_0 = None
+
+    for id_0, id_1 in zip(candidates[0].tolist(), candidates[1].tolist()):
+
+        # the face0 polygon is already on the xy plane of its own frame
+        origin, axes = frames0[id_0, 0], frames0[id_0, 1:]
+        if id_0 != last_id_0:
+            last_id_0 = id_0
+            local_0 = table0["local"][offsets0[id_0] : offsets0[id_0 + 1]]  # noqa: E203
+
+            # check if the points are on the xy plane within the tolerance and the area is big enough
+            shapely_polygon_0, prepared_polygon_0 = _face_shape(shapes0, id_0, local_0)
+            if (abs(local_0[:, 2]) >= tmax).any() or shapely_polygon_0.area < amin:
+                print("WARNING: shapely_polygon_0 is None, frame or polygon is bad")
+                shapely_polygon_0 = None
+
+        if shapely_polygon_0 is None:
+            continue
+
+        # map the face1 frame to the face0 frame, 2D affine transformation and the heights of the points
+        local = table1["local"][offsets1[id_1] : offsets1[id_1 + 1]]  # noqa: E203
+        shapely_polygon_1, _ = _face_shape(shapes1, id_1, local)
+        if shapely_polygon_1.area < amin:
+            continue
+
+        matrix = dot(frames1[id_1, 1:], axes.T)
+        offset = dot(frames1[id_1, 0] - origin, axes.T)
+        if (abs(dot(local, matrix[:, 2]) + offset[2]) >= tmax).any():
+            continue
+
+        # check if polygons intersect
+        shapely_polygon_1 = _to_frame(local, matrix, offset, local_0, snap)
+        if not prepared_polygon_0.intersects(shapely_polygon_1):
+            continue
+
+        # get intersection area and check if it is big enough within the given tolerance
+        intersection = shapely_polygon_0.intersection(shapely_polygon_1)
+        if intersection.area < amin:
+            continue
+
+        # convert shapely polygon coordinates back to the frame
+        for part in getattr(intersection, "geoms", [intersection]):
+            if part.geom_type != "Polygon" or part.area < amin:
+                continue
+            coords = part.exterior.coords[:-1]
+            world = [(origin + axes[0] * x + axes[1] * y).tolist() for x, y in coords]
+            interfaces.append([(id_0, id_1), world])
+
+    # output
+    return interfaces
+
+
+def _face_shape(shapes, id, local):
+    """get the shapely polygon of a face in its own frame and its prepared geometry from the cache"""
+    shape = shapes.get(id)
+    if shape is None:
+        from shapely.geometry import Polygon as ShapelyPolygon
+        from shapely.prepared import prep
+
+        shapely_polygon = ShapelyPolygon(local[:, :2])
+        shape = shapes[id] = (shapely_polygon, prep(shapely_polygon))
+    return shape
+
+
+def _to_frame(local, matrix, offset, local_0, snap):
+    """map the face1 points to the xy plane of the face0 frame by a 2D affine transformation,
+    the points closer than the snap distance to a face0 point are moved onto it,
+    the rounding of the transformation would otherwise leave shared corners a few ulps apart,
+    and shapely then drops some of the interfaces found by the previous plane projection"""
+    from numpy import dot, einsum
+    from shapely.geometry import Polygon as ShapelyPolygon
+
+    coords = dot(local[:, :2], matrix[:2, :2]) + offset[:2]
+    if snap <= 0.0:
+        return ShapelyPolygon(coords)
+    vectors = coords[:, None] - local_0[None, :, :2]
+    closest = einsum("ijk,ijk->ij", vectors, vectors).argmin(axis=1)
+    snapped = ((coords - local_0[closest, :2]) ** 2).sum(axis=1) < snap**2
+    coords[snapped] = local_0[closest[snapped], :2]
+    return ShapelyPolygon(coords)
+
+
+def _bounds_radius(bounds):
+    """radius of the disc around the frame origin that contains the 2D bounds xmin, ymin, xmax, ymax"""
+    from numpy import abs, hypot, maximum
+
+    return hypot(maximum(abs(bounds[:, 0]), abs(bounds[:, 2])), maximum(abs(bounds[:, 1]), abs(bounds[:, 3])))
+
+
+def _box_corners(lower, upper):
+    """(n, 8, 3) corners of the boxes in the order of compas.geometry.bounding_box"""
+    from numpy import stack
+
+    x0, y0, z0 = lower[:, 0], lower[:, 1], lower[:, 2]
+    x1, y1, z1 = upper[:, 0], upper[:, 1], upper[:, 2]
+    xs = stack([x0, x1, x1, x0, x0, x1, x1, x0], axis=1)
+    ys = stack([y0, y0, y1, y1, y0, y0, y1, y1], axis=1)
+    zs = stack([z0, z0, z0, z0, z1, z1, z1, z1], axis=1)
+    return stack([xs, ys, zs], axis=2)
+
+
+def _frame_point_box(element, inflate):
+    """box around the frame origin of an element without geometry points"""
+    return bounding_box(
+        [
+            element.frame.point + Vector(inflate, inflate, inflate),
+            element.frame.point - Vector(inflate, inflate, inflate),
+        ]
+    )
+
+
+def _check_mesh(element):
+    """raise an error naming the element if its first geometry is not the mesh of the face-to-face detection"""
+    if len(element.geometry) == 0:
+        raise AssertionError(
+            "The element {} ({}) has no geometry, assign a mesh to it".format(element.name, element.guid)
+        )
+    if not isinstance(element.geometry[0], Mesh):
+        raise AssertionError(
+            "The first geometry of the element {} ({}) must be a mesh, got {}".format(
+                element.name, element.guid, type(element.geometry[0]).__name__
+            )
+        )
+
+
+def _face_to_face_chunk(payload):
+    """Worker of Algorithms.face_to_face_pairs, payload is (tables, pairs, tmax, amin, snap).
+
+    The tables are the face tables cached by the elements, or the mesh polygons to build them from in the worker.
+    """
+    tables, pairs, tmax, amin, snap = payload
+    tables = {id: table if isinstance(table, dict) else _face_table(table) for id, table in tables.items()}
+    shapes = {id: {} for id in tables}
+    return [_face_to_face_tables(tables[i], tables[j], tmax, amin, shapes[i], shapes[j], snap=snap) for i, j in pairs]
+
+
 class Algorithms:
     # ==========================================================================
     # METHODS - FACE-TO-FACE DETECTION
     # ==========================================================================
     @staticmethod
     def get_collision_pairs(elements, aabb_and_oobb_infliation=0.01):
+        Algorithms.inflate_bounding_boxes(elements, aabb_and_oobb_infliation)
+
         # ==========================================================================
-        # SIMPLE FOR LOOP
+        # SORT AND SWEEP BROAD PHASE, FOLLOWED BY THE OOBB NARROW PHASE
         # ==========================================================================
-        for e in elements:
-            e.aabb(aabb_and_oobb_infliation)
-            e.oobb(aabb_and_oobb_infliation)
+        try:
+            aabbs = Algorithms.get_aabb_array(elements)
+        except ImportError:
+            aabbs = None
 
+        if aabbs is not None:
+            pairs = Algorithms.get_aabb_pairs_sort_and_sweep(aabbs)
+            return Algorithms._get_colliding_pairs(elements, pairs)
+
+        # ==========================================================================
+        # SIMPLE FOR LOOP
+        # ==========================================================================
         collision_pairs = []
         for i in range(len(elements)):
             for j in range(i + 1, len(elements)):
@@ -58,10 +317,24 @@ class Algorithms:
         if len(elements) != len(attributes):
             return Algorithms.get_collision_pairs(elements, aabb_and_oobb_infliation)
 
-        for e in elements:
-            e.aabb(aabb_and_oobb_infliation)
-            e.oobb(aabb_and_oobb_infliation)
+        Algorithms.inflate_bounding_boxes(elements, aabb_and_oobb_infliation)
+
+        # ==========================================================================
+        # SORT AND SWEEP BROAD PHASE, ATTRIBUTE FILTER, OOBB NARROW PHASE
+        # ==========================================================================
+        try:
+            aabbs = Algorithms.get_aabb_array(elements)
+        except ImportError:
+            aabbs = None
+
+        if aabbs is not None:
+            pairs = Algorithms.get_aabb_pairs_sort_and_sweep(aabbs)
+            pairs = Algorithms._filter_pairs_by_attributes(pairs, attributes, skip_the_same)
+            return Algorithms._get_colliding_pairs(elements, pairs)
 
+        # ==========================================================================
+        # SIMPLE FOR LOOP
+        # ==========================================================================
         collision_pairs = []
         for i in range(len(elements)):
             for j in range(i + 1, len(elements)):
@@ -73,6 +346,386 @@ class Algorithms:
                         collision_pairs.append([i, j])
         return collision_pairs
 
+    @staticmethod
+    def compute_bounding_boxes(elements, inflate=0.00, aabb=True, oobb=True, recompute=False):
+        """Compute the axis-aligned and oriented bounding-boxes of many elements with one array pass.
+
+        The geometry points of all elements are stacked in one array, moved to the element frames at once
+        and reduced to their minimum and maximum per element. The boxes are stored in the same 8 point
+        lists as :meth:`Element.aabb` and :meth:`Element.oobb`. Like these methods, the boxes that are
+        already computed are kept when ``inflate`` is below 0.001, unless ``recompute`` is True.
+
+        Parameters
+        ----------
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements.
+        inflate : float, optional
+            Offset of the boxes.
+        aabb : bool, optional
+            Compute the axis-aligned bounding-boxes.
+        oobb : bool, optional
+            Compute the oriented bounding-boxes in the element frames.
+        recompute : bool, optional
+            Compute also the boxes that are already cached.
+
+        Returns
+        -------
+        None
+        """
+        from numpy import asarray, concatenate, cumsum, einsum, maximum, minimum, repeat, zeros
+
+        # --------------------------------------------------------------------------
+        # collect the geometry points of the elements that need new boxes
+        # --------------------------------------------------------------------------
+        cached = abs(inflate) < 0.001 and not recompute
+        todo_aabb, todo_oobb = [], []
+        points_aabb, points_oobb = [], []
+        for e in elements:
+            do_aabb = aabb and not (cached and getattr(e, "_aabb", None))
+            do_oobb = oobb and not (cached and getattr(e, "_oobb", None))
+            if not do_aabb and not do_oobb:
+                continue
+
+            points, extra = e._bounding_box_points(inflate)
+            if do_aabb:
+                if len(points) + len(extra) == 0:
+                    if inflate > 0.00:
+                        e._aabb = _frame_point_box(e, inflate)
+                else:
+                    todo_aabb.append(e)
+                    points_aabb.append(points + extra)
+            if do_oobb:
+                if len(points) < 2:
+                    if inflate > 0.00:
+                        e._oobb = _frame_point_box(e, inflate)
+                else:
+                    todo_oobb.append(e)
+                    points_oobb.append(points)
+
+        # --------------------------------------------------------------------------
+        # axis-aligned boxes, min and max per element
+        # --------------------------------------------------------------------------
+        if todo_aabb:
+            counts = [len(points) for points in points_aabb]
+            starts = concatenate([[0], cumsum(counts)[:-1]])
+            points = asarray([point for points in points_aabb for point in points], dtype=float)
+            lower = minimum.reduceat(points, starts, axis=0) - inflate
+            upper = maximum.reduceat(points, starts, axis=0) + inflate
+            for e, corners in zip(todo_aabb, _box_corners(lower, upper).tolist()):
+                e._aabb = corners
+
+        # --------------------------------------------------------------------------
+        # oriented boxes, the points are moved to the element frames by one product
+        # --------------------------------------------------------------------------
+        if todo_oobb:
+            counts = [len(points) for points in points_oobb]
+            starts = concatenate([[0], cumsum(counts)[:-1]])
+            points = asarray([point for points in points_oobb for point in points], dtype=float)
+            origins = zeros((len(todo_oobb), 3))
+            axes = zeros((len(todo_oobb), 3, 3))
+            for i, e in enumerate(todo_oobb):
+                origins[i] = e.frame.point
+                axes[i] = [e.frame.xaxis, e.frame.yaxis, e.frame.zaxis]
+            owner = repeat(range(len(todo_oobb)), counts)
+            local = einsum("ij,ikj->ik", points - origins[owner], axes[owner])
+            lower = minimum.reduceat(local, starts, axis=0) - inflate
+            upper = maximum.reduceat(local, starts, axis=0) + inflate
+            corners = origins[:, None] + einsum("ijk,ikl->ijl", _box_corners(lower, upper), axes)
+            for e, box in zip(todo_oobb, corners.tolist()):
+                e._oobb = box
+
+    @staticmethod
+    def inflate_bounding_boxes(elements, inflate=0.00, aabb=True, oobb=True):
+        """Compute the inflated bounding-boxes of the elements in one batch, see :meth:`compute_bounding_boxes`,
+        or element by element when NumPy is not available.
+
+        Parameters
+        ----------
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements.
+        inflate : float, optional
+            Offset of the boxes.
+        aabb : bool, optional
+            Compute the axis-aligned bounding-boxes.
+        oobb : bool, optional
+            Compute the oriented bounding-boxes in the element frames.
+
+        Returns
+        -------
+        None
+        """
+        try:
+            Algorithms.compute_bounding_boxes(elements, inflate, aabb, oobb)
+        except ImportError:
+            for e in elements:
+                if aabb:
+                    e.aabb(inflate)
+                if oobb:
+                    e.oobb(inflate)
+
+    @staticmethod
+    def get_aabb_array(elements):
+        """Pack the axis-aligned bounding-boxes of the elements into one array.
+
+        Parameters
+        ----------
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements, their current ``_aabb`` is used, call ``Element.aabb`` first to inflate it.
+
+        Returns
+        -------
+        numpy.ndarray
+            An (n, 6) float array of ``[xmin, ymin, zmin, xmax, ymax, zmax]`` rows.
+            Elements without a bounding-box are stored as rows of NaN and never collide.
+        """
+        from numpy import full, nan
+
+        # the boxes that are not computed yet are computed in one batch
+        Algorithms.compute_bounding_boxes(elements, aabb=True, oobb=False)
+
+        aabbs = full((len(elements), 6), nan)
+        for i, e in enumerate(elements):
+            box = e.aabb()
+            if box:
+                aabbs[i, :3] = box[0]
+                aabbs[i, 3:] = box[6]
+        return aabbs
+
+    @staticmethod
+    def get_aabb_pairs_sort_and_sweep(aabbs, chunk_size=1000000):
+        """Find the overlapping pairs of axis-aligned bounding-boxes by sort-and-sweep.
+
+        The boxes are sorted by their minimum along the axis with the largest spread of centers.
+        Every box is swept against the boxes that start before it ends on that axis,
+        and the candidates are culled with masked interval tests on the two other axes.
+
+        Parameters
+        ----------
+        aabbs : numpy.ndarray
+            An (n, 6) float array of ``[xmin, ymin, zmin, xmax, ymax, zmax]`` rows, see :meth:`get_aabb_array`.
+        chunk_size : int, optional
+            Maximum number of candidate pairs tested at once, it bounds the temporary memory.
+
+        Returns
+        -------
+        numpy.ndarray
+            An (m, 2) integer array of pairs ``[i, j]`` with ``i < j``, sorted by ``i`` and then by ``j``.
+            Touching boxes are considered overlapping, the same as :meth:`Element.has_collision`.
+        """
+        from numpy import arange, argsort, concatenate, cumsum, empty, isnan, lexsort, repeat, searchsorted
+
+        # --------------------------------------------------------------------------
+        # skip elements without bounding-boxes
+        # --------------------------------------------------------------------------
+        valid = ~isnan(aabbs).any(axis=1)
+        indices = valid.nonzero()[0]
+        if len(indices) < 2:
+            return empty((0, 2), dtype=int)
+        mins = aabbs[indices, :3]
+        maxs = aabbs[indices, 3:]
+
+        # --------------------------------------------------------------------------
+        # sort along the axis where the boxes are spread the most
+        # --------------------------------------------------------------------------
+        axis = int(((mins + maxs) * 0.5).var(axis=0).argmax())
+        other_axes = [a for a in range(3) if a != axis]
+        order = argsort(mins[:, axis], kind="stable")
+        mins = mins[order]
+        maxs = maxs[order]
+
+        # --------------------------------------------------------------------------
+        # the boxes after the sorted position p that start before p ends
+        # --------------------------------------------------------------------------
+        n = len(order)
+        ends = searchsorted(mins[:, axis], maxs[:, axis], side="right")
+        counts = ends - arange(n) - 1
+        counts[counts < 0] = 0
+        totals = cumsum(counts)
+
+        # --------------------------------------------------------------------------
+        # expand candidates in chunks and test the two remaining axes
+        # --------------------------------------------------------------------------
+        result_a = []
+        result_b = []
+        start = 0
+        while start < n:
+            offset = totals[start - 1] if start > 0 else 0
+            stop = max(int(searchsorted(totals, offset + chunk_size, side="right")), start + 1)
+            stop = min(stop, n)
+
+            chunk_counts = counts[start:stop]
+            number_of_candidates = int(chunk_counts.sum())
+            if number_of_candidates > 0:
+                a = repeat(arange(start, stop), chunk_counts)
+                local = arange(number_of_candidates) - repeat(totals[start:stop] - chunk_counts - offset, chunk_counts)
+                b = a + 1 + local
+
+                mask = (mins[b, other_axes[0]] <= maxs[a, other_axes[0]]) & (
+                    mins[a, other_axes[0]] <= maxs[b, other_axes[0]]
+                )
+                mask &= (mins[b, other_axes[1]] <= maxs[a, other_axes[1]]) & (
+                    mins[a, other_axes[1]] <= maxs[b, other_axes[1]]
+                )
+                result_a.append(a[mask])
+                result_b.append(b[mask])
+            start = stop
+
+        if not result_a:
+            return empty((0, 2), dtype=int)
+
+        # --------------------------------------------------------------------------
+        # map the sorted positions back to the element indices, i < j
+        # --------------------------------------------------------------------------
+        a = indices[order[concatenate(result_a)]]
+        b = indices[order[concatenate(result_b)]]
+        pairs = empty((len(a), 2), dtype=int)
+        swap = a > b
+        pairs[:, 0] = a
+        pairs[:, 1] = b
+        pairs[swap, 0] = b[swap]
+        pairs[swap, 1] = a[swap]
+        return pairs[lexsort((pairs[:, 1], pairs[:, 0]))]
+
+    @staticmethod
+    def _filter_pairs_by_attributes(pairs, attributes, skip_the_same=True):
+        """Keep the pairs with different attributes, or with equal ones if skip_the_same is False."""
+        if len(pairs) == 0 or len(attributes) == 0:
+            return pairs
+
+        from numpy import asarray
+
+        try:
+            codes = {}
+            attribute_codes = asarray([codes.setdefault(attribute, len(codes)) for attribute in attributes])
+            are_the_same = attribute_codes[pairs[:, 0]] == attribute_codes[pairs[:, 1]]
+        except TypeError:
+            # unhashable attributes, e.g. lists, are compared one pair at a time
+            are_the_same = asarray([attributes[i] == attributes[j] for i, j in pairs.tolist()], dtype=bool)
+        return pairs[~are_the_same] if skip_the_same else pairs[are_the_same]
+
+    @staticmethod
+    def get_oobb_array(elements):
+        """Stack the eight corners of the oriented bounding-boxes of the elements into one array.
+
+        Parameters
+        ----------
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements, their current ``_oobb`` is used, call ``Element.oobb`` first to inflate it.
+
+        Returns
+        -------
+        numpy.ndarray
+            An (n, 8, 3) float array, elements without an oriented bounding-box are filled with NaN.
+        """
+        from numpy import full, nan
+
+        # the boxes that are not computed yet are computed in one batch
+        Algorithms.compute_bounding_boxes(elements, aabb=False, oobb=True)
+
+        oobbs = full((len(elements), 8, 3), nan)
+        for i, e in enumerate(elements):
+            box = e.oobb()
+            if box:
+                oobbs[i] = box
+        return oobbs
+
+    @staticmethod
+    def get_oobb_collision_mask(oobbs, pairs, chunk_size=100000):
+        """Test the pairs of oriented bounding-boxes for collision with the separating axis theorem.
+
+        The same 15 axes as :meth:`Element.has_collision` are tested for all pairs at once:
+        the three axes of each box and the nine cross products between them.
+
+        Parameters
+        ----------
+        oobbs : numpy.ndarray
+            An (n, 8, 3) float array of box corners, see :meth:`get_oobb_array`.
+        pairs : numpy.ndarray
+            An (m, 2) integer array of candidate pairs.
+        chunk_size : int, optional
+            Maximum number of pairs tested at once, it bounds the temporary memory.
+
+        Returns
+        -------
+        numpy.ndarray
+            An (m,) boolean array, True where the boxes collide.
+            Pairs with a missing box are never colliding.
+        """
+        from numpy import abs, asarray, concatenate, cross, einsum, errstate, isnan, linalg, zeros
+
+        pairs = asarray(pairs, dtype=int).reshape(-1, 2)
+        mask = zeros(len(pairs), dtype=bool)
+        if len(pairs) == 0:
+            return mask
+
+        # --------------------------------------------------------------------------
+        # center, orthonormal axes and half sizes of each box, the same as the Frame in has_collision
+        # --------------------------------------------------------------------------
+        origin = oobbs[:, 0]
+        centers = (oobbs[:, 0] + oobbs[:, 6]) * 0.5
+        x_axis = oobbs[:, 1] - origin
+        y_axis = oobbs[:, 3] - origin
+        z_axis = cross(x_axis, y_axis)
+        half_sizes = (
+            concatenate(
+                [
+                    linalg.norm(x_axis, axis=1)[:, None],
+                    linalg.norm(y_axis, axis=1)[:, None],
+                    linalg.norm(oobbs[:, 4] - origin, axis=1)[:, None],
+                ],
+                axis=1,
+            )
+            * 0.5
+        )
+
+        with errstate(invalid="ignore", divide="ignore"):
+            x_axis = x_axis / linalg.norm(x_axis, axis=1)[:, None]
+            z_axis = z_axis / linalg.norm(z_axis, axis=1)[:, None]
+        x_axis[isnan(x_axis)] = 0.0
+        z_axis[isnan(z_axis)] = 0.0
+        y_axis = cross(z_axis, x_axis)
+
+        axes = concatenate([x_axis[:, None], y_axis[:, None], z_axis[:, None]], axis=1)  # (n, 3, 3)
+        is_valid = ~isnan(oobbs).any(axis=(1, 2))
+
+        # --------------------------------------------------------------------------
+        # separating axis test, chunk by chunk
+        # --------------------------------------------------------------------------
+        for start in range(0, len(pairs), chunk_size):
+            stop = start + chunk_size
+            i = pairs[start:stop, 0]
+            j = pairs[start:stop, 1]
+            axes_i = axes[i]
+            axes_j = axes[j]
+
+            # the 3 + 3 face axes and the 9 edge-edge cross products, (m, 15, 3)
+            edge_axes = cross(axes_i[:, :, None, :], axes_j[:, None, :, :]).reshape(-1, 9, 3)
+            test_axes = concatenate([axes_i, axes_j, edge_axes], axis=1)
+
+            # distance between the centers and the projected radii of both boxes on every axis
+            distance = abs(einsum("mk,mak->ma", centers[j] - centers[i], test_axes))
+            radius_i = einsum("mb,mba->ma", half_sizes[i], abs(einsum("mbk,mak->mba", axes_i, test_axes)))
+            radius_j = einsum("mb,mba->ma", half_sizes[j], abs(einsum("mbk,mak->mba", axes_j, test_axes)))
+
+            is_separated = (distance > radius_i + radius_j).any(axis=1)
+            mask[start:stop] = ~is_separated & is_valid[i] & is_valid[j]
+
+        return mask
+
+    @staticmethod
+    def _get_colliding_pairs(elements, pairs):
+        """Run the batched oobb narrow phase over the candidate pairs and output them as a list of lists."""
+        from numpy import unique
+
+        if len(pairs) == 0:
+            return []
+
+        # only the boxes of the elements in the candidate pairs are needed
+        used, local_pairs = unique(pairs, return_inverse=True)
+        oobbs = Algorithms.get_oobb_array([elements[i] for i in used.tolist()])
+        mask = Algorithms.get_oobb_collision_mask(oobbs, local_pairs.reshape(-1, 2))
+        return pairs[mask].tolist()
+
     @staticmethod
     def has_collision(elements):
         # ==========================================================================
@@ -90,6 +743,12 @@ class Algorithms:
     def get_collision_pairs_kdtree(
         elements, max_neighbours=10, check_element_collsion=True, attributes=[], skip_the_same=True
     ):
+        # without the neighbour cap, the exact candidate set is found by one radius query
+        if max_neighbours is None:
+            return Algorithms.get_collision_pairs_kdtree_radius(
+                elements, check_element_collsion, attributes, skip_the_same
+            )
+
         # get points
         points = []
         diagonal_distances = []
@@ -157,145 +816,391 @@ class Algorithms:
         return list_of_lists
 
     @staticmethod
-    def face_to_face(element0, element1, tmax=1e-2, amin=1e1):
-        """construct interfaces by intersecting coplanar mesh faces
+    def get_collision_pairs_kdtree_radius(elements, check_element_collsion=True, attributes=[], skip_the_same=True):
+        """Find the colliding elements with a kd-tree over the bounding-box centers, without a neighbour cap.
+
+        Two axis-aligned boxes can only overlap if their centers are closer than the sum of their half diagonals,
+        which is never larger than the diagonal of the larger box. Every center is queried with its own diagonal
+        as radius in one batched ``query_ball_point`` call, and a pair is kept from the side of its larger element,
+        so one large element does not widen the search of all others.
+        The candidates are then culled by the exact box interval test, so no contact is lost.
+
         Parameters
         ----------
-        assembly : compas_assembly.datastructures.Assembly
-            An assembly of discrete blocks.
-        nmax : int, optional
-            Maximum number of neighbours per block.
-        tmax : float, optional
-            Maximum deviation from the perfectly flat interface plane.
-        amin : float, optional
-            Minimum area of a "face-face" interface.
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements, their current bounding-boxes are used.
+        check_element_collsion : bool, optional
+            If True, the candidate pairs are also tested by the oriented bounding-boxes.
+        attributes : list, optional
+            One attribute per element to filter the pairs, see :meth:`get_collision_pairs_with_attributes`.
+        skip_the_same : bool, optional
+            If True, only elements with different attributes collide, otherwise only elements with the same ones.
 
         Returns
         -------
-        Polygon of the Interface - :class:`compas.geometry.Polygon`
-        Current Element ID - list[int]
-        Other Element ID - list[int]
-        Current Element Face Index - int
-        Other Element Face Index - int
+        list[list[int, int]]
+            The pairs of element indices, sorted by the first and the second index.
         """
+        from numpy import arange, asarray, concatenate, empty, isnan, lexsort, linalg, repeat
+        from scipy.spatial import cKDTree
 
         # --------------------------------------------------------------------------
-        # sanity check
+        # centers and half diagonals of the valid boxes
         # --------------------------------------------------------------------------
-        if shapely_available is False:
+        aabbs = Algorithms.get_aabb_array(elements)
+        indices = (~isnan(aabbs).any(axis=1)).nonzero()[0]
+        if len(indices) < 2:
             return []
-
-        if len(element0.geometry) == 0 or len(element1.geometry) == 0:
-            raise AssertionError("You must assign geometry geometry to the element")
-
-        if not isinstance(element0.geometry[0], Mesh) or not isinstance(element1.geometry[0], Mesh):
-            raise AssertionError("The geometry must be a mesh")
+        mins = aabbs[indices, :3]
+        maxs = aabbs[indices, 3:]
+        centers = (mins + maxs) * 0.5
+        half_diagonals = linalg.norm(maxs - mins, axis=1) * 0.5
 
         # --------------------------------------------------------------------------
-        # iterate face polygons and get intersection area
-        # DEPENDENCY: shapely library
+        # one radius query per center with its own diagonal, then the exact box test
+        # a pair is kept from its larger element, the index breaks the ties
         # --------------------------------------------------------------------------
+        tree = cKDTree(centers)
+        neighbours = tree.query_ball_point(centers, r=2.0 * half_diagonals, return_sorted=False)
+        counts = asarray([len(n) for n in neighbours], dtype=int)
+        if counts.sum() == 0:
+            return []
+        a = repeat(arange(len(centers)), counts)
+        b = concatenate([asarray(n, dtype=int) for n in neighbours])
+        keep = (half_diagonals[b] < half_diagonals[a]) | ((half_diagonals[b] == half_diagonals[a]) & (a < b))
+        a, b = a[keep], b[keep]
+        mask = ((mins[a] <= maxs[b]) & (mins[b] <= maxs[a])).all(axis=1)
+
+        pairs = empty((int(mask.sum()), 2), dtype=int)
+        pairs[:, 0] = indices[a[mask]]
+        pairs[:, 1] = indices[b[mask]]
+        pairs.sort(axis=1)
+        pairs = pairs[lexsort((pairs[:, 1], pairs[:, 0]))]
 
-        def to_shapely_polygon(matrix, polygon, tmax=1e-3, amin=1e-1):
-            """convert a compas polygon to shapely polygon on xy plane"""
+        # --------------------------------------------------------------------------
+        # attributes and oobb narrow phase
+        # --------------------------------------------------------------------------
+        if len(elements) == len(attributes):
+            pairs = Algorithms._filter_pairs_by_attributes(pairs, attributes, skip_the_same)
+        if check_element_collsion:
+            return Algorithms._get_colliding_pairs(elements, pairs)
+        return pairs.tolist()
 
-            # orient points to the xy plane
-            projected = transform_points(polygon.points, matrix)
-            # geometry.append(Polygon(projected))
+    @staticmethod
+    def get_collision_pairs_grid(
+        elements, cell_size=None, check_element_collsion=True, attributes=[], skip_the_same=True
+    ):
+        """Find the colliding elements with a uniform spatial hash grid.
 
-            # check if the oriented point is on the xy plane within the tolerance
-            # then return the shapely polygon
-            if not all(fabs(point[2]) < tmax for point in projected):
-                # for point in projected:
-                #     print("tolerance is off " + str(fabs(point[2])) + " > " + str(tmax))
-                return None
-            elif polygon.area < amin:
-                # print("area is off " + str(polygon.area) + " < " + str(amin))
-                return None
-            else:
-                return ShapelyPolygon(projected)
+        The elements are streamed into the grid one by one, each is queried against the elements inserted before it,
+        so the search is linear in the number of elements when they have similar sizes.
 
-        def to_compas_polygon(matrix, shapely_polygon):
-            """convert a shapely polygon to compas polygon back to the frame"""
+        Parameters
+        ----------
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements, their current bounding-boxes are used.
+        cell_size : float, optional
+            The edge length of the grid cells.
+            Default is the median of the largest :attr:`Element.dimensions` of the elements.
+        check_element_collsion : bool, optional
+            If True, the candidate pairs are also tested by the oriented bounding-boxes.
+        attributes : list, optional
+            One attribute per element to filter the pairs, see :meth:`get_collision_pairs_with_attributes`.
+        skip_the_same : bool, optional
+            If True, only elements with different attributes collide, otherwise only elements with the same ones.
 
-            # convert coordiantes to 3D by adding the z coordinate
-            coords = [[x, y, 0.0] for x, y, _ in shapely_polygon.exterior.coords]
+        Returns
+        -------
+        list[list[int, int]]
+            The pairs of element indices, sorted by the first and the second index.
+        """
+        Algorithms.inflate_bounding_boxes(elements)
+        if cell_size is None:
+            sizes = sorted(max(e.dimensions) for e in elements if e.oobb())
+            cell_size = sizes[len(sizes) // 2] if sizes else 0.0
+            cell_size = cell_size if cell_size > 0.0 else 1.0
 
-            # orient points to the original first mesh frame
-            coords = transform_points(coords, matrix.inverted())[:-1]
+        # --------------------------------------------------------------------------
+        # broad phase - streaming insertion, every pair is reported once
+        # --------------------------------------------------------------------------
+        grid = SpatialHash(cell_size)
+        pairs = []
+        for i, e in enumerate(elements):
+            box = e.aabb()
+            if not box:
+                continue
+            for j in grid.insert_and_query(i, box):
+                pairs.append([j, i])
+        pairs.sort()
 
-            # convert to compas polygon
-            return Polygon(coords)
+        # --------------------------------------------------------------------------
+        # attributes and oobb narrow phase
+        # --------------------------------------------------------------------------
+        from numpy import asarray
 
-        def is_coplanar(frame0, frame1, t_normal_colinearity=1e-1, t_dist_frames=1e-1):
-            """check if two frames are coplanar and at the same position"""
+        pairs = asarray(pairs, dtype=int).reshape(-1, 2)
+        if len(elements) == len(attributes):
+            pairs = Algorithms._filter_pairs_by_attributes(pairs, attributes, skip_the_same)
+        if check_element_collsion:
+            return Algorithms._get_colliding_pairs(elements, pairs)
+        return pairs.tolist()
 
-            # get the normal vector of the first frame
-            normal0 = frame0.normal
+    @staticmethod
+    def get_collision_pairs_bvh(elements, bvh, aabb_and_oobb_infliation=0.01, attributes=[], skip_the_same=True):
+        """Find the colliding elements using a persistent bounding-volume hierarchy, e.g. :attr:`Model.bvh`.
 
-            # get the normal vector of the second frame
-            normal1 = frame1.normal
+        Parameters
+        ----------
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements, the hierarchy keys are their GUID strings. Missing elements are inserted.
+        bvh : :class:`compas_assembly2.BVH`
+            The spatial index of the element axis-aligned bounding-boxes.
+        aabb_and_oobb_infliation : float, optional
+            The boxes are considered inflated by this value.
+        attributes : list, optional
+            One attribute per element to filter the pairs, see :meth:`get_collision_pairs_with_attributes`.
+        skip_the_same : bool, optional
+            If True, only elements with different attributes collide, otherwise only elements with the same ones.
 
-            cross_product = normal0.cross(normal1)
+        Returns
+        -------
+        list[list[int, int]]
+            The pairs of element indices, sorted by the first and the second index.
+        """
+        keys = [str(e.guid) for e in elements]
+        for key, e in zip(keys, elements):
+            if key not in bvh and e.aabb():
+                bvh.insert(key, e.aabb())
 
-            # check if the two normal vectors are parallel
-            are_parellel = abs(cross_product.length) < t_normal_colinearity
+        # --------------------------------------------------------------------------
+        # broad phase - the hierarchy collides with itself
+        # --------------------------------------------------------------------------
+        key_index = {key: i for i, key in enumerate(keys)}
+        pairs = []
+        for a, b in bvh.query_pairs(2 * aabb_and_oobb_infliation):
+            if a in key_index and b in key_index:
+                i, j = key_index[a], key_index[b]
+                pairs.append([i, j] if i < j else [j, i])
+        pairs.sort()
+
+        return Algorithms._get_colliding_candidate_pairs(
+            elements, pairs, aabb_and_oobb_infliation, attributes, skip_the_same
+        )
 
-            # are planes at the same positions?
-            plane = Plane(frame0.point, frame0.normal)
-            projected_point = plane.projected_point(frame1.point)
-            are_close = distance_point_point(projected_point, frame1.point) < t_dist_frames
-            return are_parellel and are_close
+    @staticmethod
+    def get_collision_pairs_bvh_of(
+        elements, bvh, indices, aabb_and_oobb_infliation=0.01, attributes=[], skip_the_same=True
+    ):
+        """Find the colliding pairs that contain at least one of the given elements, e.g. the edited ones.
 
-        interfaces = []
+        The given elements are queried one by one in the hierarchy, so the cost is proportional to their
+        number and to the size of their neighbourhoods, not to the size of the model.
 
-        for id_0, face_polygon_0 in enumerate(element0.face_polygons):
+        Parameters
+        ----------
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements, the hierarchy keys are their GUID strings.
+        bvh : :class:`compas_assembly2.BVH`
+            The spatial index of the element axis-aligned bounding-boxes, up to date for the given elements.
+        indices : list[int]
+            The indices of the elements to query.
+        aabb_and_oobb_infliation : float, optional
+            The boxes are considered inflated by this value.
+        attributes : list, optional
+            One attribute per element to filter the pairs, see :meth:`get_collision_pairs_with_attributes`.
+        skip_the_same : bool, optional
+            If True, only elements with different attributes collide, otherwise only elements with the same ones.
 
-            # get the transformation matrix
-            matrix = Transformation.from_frame_to_frame(element0.face_frames[id_0].copy(), Frame.worldXY())
+        Returns
+        -------
+        list[list[int, int]]
+            The pairs of element indices, sorted by the first and the second index.
+        """
+        key_index = {str(e.guid): i for i, e in enumerate(elements)}
 
-            # get the shapely polygon
-            shapely_polygon_0 = to_shapely_polygon(matrix, face_polygon_0, tmax, amin)
-            if shapely_polygon_0 is None:
-                # print(face_polygon_0)
-                # print(element0.face_frames[id_0])
-                # ca2.global_geometry.append(face_polygon_0)
-                # ca2.global_geometry.append(element0.face_frames[id_0])
-                print("WARNING: shapely_polygon_0 is None, frame or polygon is bad")
+        # --------------------------------------------------------------------------
+        # broad phase - the neighbourhood of each given element
+        # --------------------------------------------------------------------------
+        pairs = set()
+        for i in indices:
+            if not elements[i].aabb():
                 continue
+            for key in bvh.query_box(elements[i].aabb(), 2 * aabb_and_oobb_infliation):
+                j = key_index.get(key)
+                if j is not None and j != i:
+                    pairs.add((i, j) if i < j else (j, i))
+        pairs = [list(pair) for pair in sorted(pairs)]
 
-            for id_1, face_polygon_1 in enumerate(element1.face_polygons):
+        return Algorithms._get_colliding_candidate_pairs(
+            elements, pairs, aabb_and_oobb_infliation, attributes, skip_the_same
+        )
 
-                if is_coplanar(element0.face_frames[id_0], element1.face_frames[id_1]) is False:
+    @staticmethod
+    def _get_colliding_candidate_pairs(elements, pairs, aabb_and_oobb_infliation, attributes, skip_the_same):
+        """The narrow phase of the hierarchy searches, only the elements in the candidate pairs are inflated."""
+        candidates = sorted(set(i for pair in pairs for i in pair))
+        Algorithms.inflate_bounding_boxes([elements[i] for i in candidates], aabb_and_oobb_infliation, aabb=False)
+
+        try:
+            from numpy import asarray
+        except ImportError:
+            collision_pairs = []
+            for i, j in pairs:
+                if len(elements) == len(attributes) and (attributes[i] != attributes[j]) != skip_the_same:
                     continue
+                if elements[i].has_collision(elements[j]):
+                    collision_pairs.append([i, j])
+            return collision_pairs
 
-                # print(id_0, id_1)
+        pairs = asarray(pairs, dtype=int).reshape(-1, 2)
+        if len(elements) == len(attributes):
+            pairs = Algorithms._filter_pairs_by_attributes(pairs, attributes, skip_the_same)
+        return Algorithms._get_colliding_pairs(elements, pairs)
 
-                # get the shapely polygon
-                shapely_polygon_1 = to_shapely_polygon(matrix, face_polygon_1, tmax, amin)
-                if shapely_polygon_1 is None:
-                    # print("WARNING: shapely_polygon_1 is None, frame or polygon is bad")
-                    continue
+    @staticmethod
+    def face_to_face(element0, element1, tmax=1e-2, amin=1e1, snap=None):
+        """construct interfaces by intersecting coplanar mesh faces
+        Parameters
+        ----------
+        assembly : compas_assembly.datastructures.Assembly
+            An assembly of discrete blocks.
+        nmax : int, optional
+            Maximum number of neighbours per block.
+        tmax : float, optional
+            Maximum deviation from the perfectly flat interface plane.
+        amin : float, optional
+            Minimum area of a "face-face" interface.
+        snap : float, optional
+            The points of the second face closer than this distance to a corner of the first face are moved
+            onto the corner before the intersection, so faces sharing corners do not lose their interface
+            to rounding errors. None uses ``tmax * 1e-3``, 0 disables it.
 
-                # check if polygons intersect
-                if not shapely_polygon_0.intersects(shapely_polygon_1):
-                    # print("shapely_polygon_0.intersects(shapely_polygon_1)")
-                    continue
+        Returns
+        -------
+        Polygon of the Interface - :class:`compas.geometry.Polygon`
+        Current Element ID - list[int]
+        Other Element ID - list[int]
+        Current Element Face Index - int
+        Other Element Face Index - int
+        """
 
-                # get intersection area and check if it is big enough within the given tolerance
-                intersection = shapely_polygon_0.intersection(shapely_polygon_1)
-                area = intersection.area
-                if area < amin:
-                    # print("area is off " + str(area) + " < " + str(amin))
-                    continue
+        # --------------------------------------------------------------------------
+        # sanity check
+        # --------------------------------------------------------------------------
+        if not _check_shapely():
+            return []
+        _check_mesh(element0)
+        _check_mesh(element1)
 
-                # convert shapely polygon to compas polygon
-                polygon = to_compas_polygon(matrix, intersection)
+        # --------------------------------------------------------------------------
+        # iterate face polygons and get intersection area
+        # DEPENDENCY: shapely library
+        # --------------------------------------------------------------------------
+        table0 = Algorithms.get_face_table(element0)
+        table1 = Algorithms.get_face_table(element1)
+        interfaces = _face_to_face_tables(
+            table0, table1, tmax, amin, element0.face_shapes, element1.face_shapes, snap=snap
+        )
+
+        # convert to compas polygon
+        return [[face_pair, Polygon(coords)] for face_pair, coords in interfaces]
 
-                interfaces.append([(id_0, id_1), polygon])
+    @staticmethod
+    def get_face_table(element):
+        """Get the face polygons and face frames of an element packed into arrays, see :attr:`Element.face_table`.
+
+        The table is the compact payload of the face-to-face detection, it can be sent to other processes
+        instead of the element itself. It is cached by the element until the element is transformed.
+
+        Parameters
+        ----------
+        element : :class:`compas_assembly2.Element`
+            An element whose first geometry is a mesh.
 
-        # output
-        return interfaces
+        Returns
+        -------
+        dict
+            ``"points"``, ``"offsets"``, ``"frames"``, ``"planes"`` and ``"bounds"`` arrays.
+        """
+        return element.face_table
+
+    @staticmethod
+    def face_to_face_pairs(elements, pairs, tmax=1e-2, amin=1e1, workers=1, chunk_size=256, snap=None):
+        """Run the face-to-face detection over many pairs of elements, optionally in parallel processes.
+
+        The workers receive the mesh polygons of the elements instead of the elements, build the face tables,
+        see :meth:`get_face_table`, and cache the shapely face polygons per chunk.
+        The face tables already cached by the elements are sent as they are. The serial run uses the caches
+        of the elements. The pairs are split into at least ``workers`` chunks of at most ``chunk_size`` pairs,
+        and the results are collected in the order of the pairs, so the output is the same as the serial run.
+        When ``workers > 1``, call it from a ``if __name__ == "__main__":`` block of your script.
+
+        Parameters
+        ----------
+        elements : list[:class:`compas_assembly2.Element`]
+            The elements.
+        pairs : list[list[int, int]]
+            The pairs of element indices, e.g. the collision pairs.
+        tmax : float, optional
+            Maximum deviation from the perfectly flat interface plane.
+        amin : float, optional
+            Minimum area of a "face-face" interface.
+        workers : int, optional
+            Number of processes, 1 runs in the current process.
+        chunk_size : int, optional
+            Maximum number of pairs sent to a process at once.
+        snap : float, optional
+            The snap distance of the face corners, see :meth:`face_to_face`.
+
+        Returns
+        -------
+        list[list]
+            For each pair, the list of interfaces in the :meth:`face_to_face` format.
+        """
+        if not _check_shapely():
+            return [[] for _ in pairs]
+
+        pairs = [[int(i), int(j)] for i, j in pairs]
+        ids = []
+        for i, j in pairs:
+            for id in (i, j):
+                if id not in ids:
+                    _check_mesh(elements[id])
+                    ids.append(id)
+
+        # --------------------------------------------------------------------------
+        # serial or parallel execution over chunks of pairs
+        # --------------------------------------------------------------------------
+        results = []
+        if workers is None or workers <= 1 or len(pairs) < 2:
+            tables = {id: Algorithms.get_face_table(elements[id]) for id in ids}
+            for i, j in pairs:
+                shapes0, shapes1 = elements[i].face_shapes, elements[j].face_shapes
+                results.append(_face_to_face_tables(tables[i], tables[j], tmax, amin, shapes0, shapes1, snap=snap))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            # the cached face tables, or the mesh polygons to build the tables in the workers
+            tables = {}
+            for id in ids:
+                table = getattr(elements[id], "_face_table", None)
+                tables[id] = table if table is not None else elements[id].geometry[0].to_polygons()
+
+            # every worker gets a chunk even when there are few pairs
+            size = max(1, min(chunk_size, -(-len(pairs) // workers)))
+            payloads = []
+            for start in range(0, len(pairs), size):
+                chunk = pairs[start : start + size]  # noqa: E203
+                chunk_tables = {id: tables[id] for pair in chunk for id in pair}
+                payloads.append((chunk_tables, chunk, tmax, amin, snap))
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # map keeps the order of the chunks
+                for chunk_results in executor.map(_face_to_face_chunk, payloads):
+                    results.extend(chunk_results)
+
+        # convert to compas polygon
+        return [[[face_pair, Polygon(coords)] for face_pair, coords in interfaces] for interfaces in results]
 
     @staticmethod
     def polyline_to_polyline(element0, element1, tmax=1e-2, amin=1e1):
@@ -311,50 +1216,62 @@ class Algorithms:
 
     @staticmethod
     def shortest_path(model, element0, element1):
+        """Get the elements on the shortest path between two elements in the interaction graph.
 
-        # ==========================================================================
-        # convert model graph to networkx graph
-        # ==========================================================================
-        import networkx as nx
-
-        # DiGraph()
-        G = nx.Graph()
-        G.graph.update(model.interactions.attributes)  # type: ignore
-
-        for node, attr in model.interactions.nodes(data=True):
-            G.add_node(node, **attr)  # type: ignore
-
-        for edge, attr in model.interactions.edges(data=True):
-            G.add_edge(*edge, weight=attr["weight"])  # type: ignore **attr,
+        Parameters
+        ----------
+        model : :class:`compas_assembly2.Model`
+        element0 : :class:`compas_assembly2.Element` | :class:`compas_assembly2.ElementNode`
+            The start element.
+        element1 : :class:`compas_assembly2.Element` | :class:`compas_assembly2.ElementNode`
+            The end element.
 
-        networkx_graph = G
+        Returns
+        -------
+        list[:class:`compas_assembly2.Element`] | None
+            The elements from the start to the end, None if the elements are not connected or not in the graph.
+        """
+        paths = Algorithms.shortest_paths(model, [element0], [element1])
+        return paths[0][0] if paths is not None else None
 
-        # ==========================================================================
-        # compute the shortest path using netowrkx, output the element list
-        # ==========================================================================
-        node_start_name = str(element0.guid)
-        node_end_name = str(element1.guid)
+    @staticmethod
+    def shortest_paths(model, sources, targets):
+        """Get the elements on the shortest paths from many sources to many targets in the interaction graph.
 
-        # Check if the nodes exist in the graph
-        if node_start_name in networkx_graph.nodes and node_end_name in networkx_graph.nodes:
+        The paths are computed by a sparse Dijkstra on :attr:`compas_assembly2.Model.interaction_adjacency`,
+        weighted by the ``weight`` attribute of the interactions.
 
-            # Find the shortest path using node names
-            keys_of_elements = nx.shortest_path(
-                networkx_graph, source=node_start_name, target=node_end_name, weight="weight"
-            )
+        Parameters
+        ----------
+        model : :class:`compas_assembly2.Model`
+        sources : list[:class:`compas_assembly2.Element` | :class:`compas_assembly2.ElementNode`]
+            The start elements.
+        targets : list[:class:`compas_assembly2.Element` | :class:`compas_assembly2.ElementNode`]
+            The end elements.
 
-            # convert to strings to elements list
-            elements = []
-            for key in keys_of_elements:
-                elements.append(model.get_element(key))
+        Returns
+        -------
+        list[list[list[:class:`compas_assembly2.Element`] | None]] | None
+            For each source and each target, the elements of the path, None if they are not connected.
+            None if one of the elements is not in the graph.
+        """
+        adjacency = model.interaction_adjacency
 
-            # print the result
-            print(f"The shortest path from {node_start_name} to {node_end_name} is: {keys_of_elements}")
+        # the element nodes are replaced by their elements
+        keys0 = [str(getattr(e, "element", e).guid) for e in sources]
+        keys1 = [str(getattr(e, "element", e).guid) for e in targets]
 
-            # output
-            return elements
-        else:
+        # Check if the nodes exist in the graph
+        if not all(key in adjacency for key in keys0 + keys1):
             print("One or both of the specified nodes do not exist in the graph.")
+            return None
+
+        # convert the keys to elements
+        elements = model._elements
+        return [
+            [[elements[key] for key in path] if path is not None else None for path in paths]
+            for paths in adjacency.shortest_paths(keys0, keys1)
+        ]
 
 
 # if __name__ == "__main__":
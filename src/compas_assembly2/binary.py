@@ -0,0 +1,508 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+import importlib
+import uuid
+
+from compas.data import json_dumps, json_loads
+from compas.datastructures import Mesh
+from compas.geometry import Frame, Line, Point, Polygon, Polyline, Vector
+
+from compas_assembly2 import JOINT_NAME, Element, Joint
+
+# ==========================================================================
+# BINARY MODEL FORMAT
+# one NumPy .npz archive, every element is stored once in columnar buffers:
+# - the element frames, insertion vectors and bounding-boxes are rows of arrays
+# - the meshes, points, lines and polylines are flattened into shared buffers indexed by offsets
+# - the hierarchy and the interactions refer to the elements by their row
+# the remaining small objects (names, attributes, other geometry) are stored as one COMPAS JSON string,
+# with the class of every element, the attributes added by the element subclasses, and the meshes with attributes
+# ==========================================================================
+
+FORMAT_VERSION = 2
+
+_POINT, _LINE, _POLYLINE = 0, 1, 2
+
+# the instance attributes of Element that are not set by its constructor,
+# the parent is set by the hierarchy and the caches are recomputed on the first use
+_ELEMENT_LAZY_STATE = [
+    "parent",
+    "_frame_global",
+    "_fabrication",
+    "_structure",
+    "_convex_hull",
+    "_face_polygons",
+    "_face_frames",
+    "_face_table",
+    "_face_shapes",
+]
+
+
+def _subclass_state(element, base_state):
+    """Get the instance attributes that a subclass of Element adds, e.g. the dimensions of a Beam."""
+    return {key: value for key, value in vars(element).items() if key not in base_state}
+
+
+def _has_attributes(mesh, empty=Mesh()):
+    """Check if a mesh has attributes that the vertex and face buffers cannot store."""
+    if mesh.attributes != empty.attributes or mesh.default_vertex_attributes != empty.default_vertex_attributes:
+        return True
+    if mesh.default_face_attributes or mesh.default_edge_attributes:
+        return True
+    if any(len(attributes) > 3 for attributes in mesh.vertex.values()):
+        return True
+    return any(mesh.facedata.values()) or any(mesh.edgedata.values())
+
+
+def _class_name(obj):
+    return "{}/{}".format(type(obj).__module__, type(obj).__qualname__)
+
+
+def _class_from_name(name):
+    module, qualname = name.split("/")
+    cls = importlib.import_module(module)
+    for attribute in qualname.split("."):
+        cls = getattr(cls, attribute)
+    return cls
+
+
+class _GeometryWriter(object):
+    """Collect the meshes, points, lines and polylines of geometry lists into flat buffers."""
+
+    def __init__(self):
+        self.mesh_vertices = []
+        self.mesh_vertex_counts = []
+        self.mesh_faces = []
+        self.mesh_face_sizes = []
+        self.mesh_face_counts = []
+        self.curve_points = []
+        self.curve_counts = []
+        self.curve_kinds = []
+
+    def encode(self, geometry):
+        """Get the slots of a geometry list: ``["mesh", i]``, ``["curve", i]``, or the object itself.
+
+        The meshes with vertex, edge, face, or mesh attributes are kept as objects, so the attributes are stored.
+        """
+        slots = []
+        for g in geometry or []:
+            if type(g) is Mesh and not _has_attributes(g):
+                vertices, faces = g.to_vertices_and_faces()
+                self.mesh_vertices.extend(vertices)
+                self.mesh_vertex_counts.append(len(vertices))
+                self.mesh_face_counts.append(len(faces))
+                for face in faces:
+                    self.mesh_faces.extend(face)
+                    self.mesh_face_sizes.append(len(face))
+                slots.append(["mesh", len(self.mesh_vertex_counts) - 1])
+            elif type(g) in (Point, Line, Polyline):
+                if type(g) is Point:
+                    points, kind = [list(g)], _POINT
+                elif type(g) is Line:
+                    points, kind = [list(g.start), list(g.end)], _LINE
+                else:
+                    points, kind = [list(p) for p in g], _POLYLINE
+                self.curve_points.extend(points)
+                self.curve_counts.append(len(points))
+                self.curve_kinds.append(kind)
+                slots.append(["curve", len(self.curve_counts) - 1])
+            else:
+                slots.append(g)
+        return slots
+
+    def arrays(self):
+        from numpy import asarray
+
+        return {
+            "mesh_vertices": asarray(self.mesh_vertices, dtype=float).reshape(-1, 3),
+            "mesh_vertex_offsets": _offsets(self.mesh_vertex_counts),
+            "mesh_faces": asarray(self.mesh_faces, dtype=int),
+            "mesh_face_offsets": _offsets(self.mesh_face_sizes),
+            "mesh_element_face_offsets": _offsets(self.mesh_face_counts),
+            "curve_points": asarray(self.curve_points, dtype=float).reshape(-1, 3),
+            "curve_offsets": _offsets(self.curve_counts),
+            "curve_kinds": asarray(self.curve_kinds, dtype=int),
+        }
+
+
+class _GeometryReader(object):
+    """Rebuild the geometry lists from the buffers of a :class:`_GeometryWriter`."""
+
+    def __init__(self, archive):
+        self.mesh_vertices = archive["mesh_vertices"].tolist()
+        self.mesh_vertex_offsets = archive["mesh_vertex_offsets"].tolist()
+        self.mesh_faces = archive["mesh_faces"].tolist()
+        self.mesh_face_offsets = archive["mesh_face_offsets"].tolist()
+        self.mesh_element_face_offsets = archive["mesh_element_face_offsets"].tolist()
+        self.curve_points = archive["curve_points"].tolist()
+        self.curve_offsets = archive["curve_offsets"].tolist()
+        self.curve_kinds = archive["curve_kinds"].tolist()
+
+    def mesh(self, i):
+        vertices = self.mesh_vertices[self.mesh_vertex_offsets[i] : self.mesh_vertex_offsets[i + 1]]  # noqa: E203
+        start, stop = self.mesh_element_face_offsets[i], self.mesh_element_face_offsets[i + 1]
+        first = self.mesh_face_offsets[start]
+        offsets = self.mesh_face_offsets[start : stop + 1]  # noqa: E203
+        indices = self.mesh_faces[first : offsets[-1]]  # noqa: E203
+        faces = [indices[a - first : b - first] for a, b in zip(offsets[:-1], offsets[1:])]  # noqa: E203
+        return Mesh.from_vertices_and_faces(vertices, faces)
+
+    def curve(self, i):
+        points = self.curve_points[self.curve_offsets[i] : self.curve_offsets[i + 1]]  # noqa: E203
+        kind = self.curve_kinds[i]
+        if kind == _POINT:
+            return Point(*points[0])
+        if kind == _LINE:
+            return Line(points[0], points[1])
+        return Polyline(points)
+
+    def decode(self, slots):
+        geometry = []
+        for slot in slots:
+            if isinstance(slot, list) and len(slot) == 2 and slot[0] == "mesh":
+                geometry.append(self.mesh(slot[1]))
+            elif isinstance(slot, list) and len(slot) == 2 and slot[0] == "curve":
+                geometry.append(self.curve(slot[1]))
+            else:
+                geometry.append(slot)
+        return geometry
+
+
+def _offsets(counts):
+    from numpy import concatenate, cumsum
+
+    return concatenate([[0], cumsum(counts, dtype=int)]).astype(int)
+
+
+def _frame_rows(frames):
+    from numpy import asarray
+
+    return asarray([[f.point, f.xaxis, f.yaxis] for f in frames], dtype=float).reshape(-1, 3, 3)
+
+
+def _box_rows(boxes):
+    from numpy import full, nan
+
+    rows = full((len(boxes), 8, 3), nan)
+    for i, box in enumerate(boxes):
+        if box:
+            rows[i] = box
+    return rows
+
+
+def _box_list(row):
+    from numpy import isnan
+
+    return [] if isnan(row).any() else row.tolist()
+
+
+# ==========================================================================
+# WRITE
+# ==========================================================================
+
+
+def model_to_npz(model, filepath, compressed=True):
+    """Write a model to a NumPy ``.npz`` archive, see :meth:`compas_assembly2.Model.to_npz`.
+
+    Parameters
+    ----------
+    model : :class:`compas_assembly2.Model`
+        The model.
+    filepath : str | file
+        The path or the open binary file of the archive.
+    compressed : bool, optional
+        If True, the arrays are compressed.
+
+    """
+    from numpy import asarray, full, nan, savez, savez_compressed
+
+    # --------------------------------------------------------------------------
+    # elements - one row each
+    # --------------------------------------------------------------------------
+    keys = list(model.elements.keys())
+    elements = list(model.elements.values())
+    rows = {key: i for i, key in enumerate(keys)}
+    writer = _GeometryWriter()
+    base_state = set(vars(Element())) | set(_ELEMENT_LAZY_STATE)
+    element_meta = []
+    for e in elements:
+        element_meta.append(
+            {
+                "type": _class_name(e),
+                "state": _subclass_state(e, base_state) if type(e) is not Element else {},
+                "name": e.name,
+                "id": e.id,
+                "attributes": e.attributes,
+                "fabrication": e.fabrication,
+                "structure": e.structure,
+                "geometry": writer.encode(e.geometry),
+                "geometry_simplified": writer.encode(e.geometry_simplified),
+            }
+        )
+
+    arrays = writer.arrays()
+    arrays["element_guids"] = asarray(keys, dtype="U36")
+    arrays["element_frames"] = _frame_rows([e.frame for e in elements])
+    arrays["element_frames_global"] = _frame_rows([e.frame_global for e in elements])
+    arrays["element_insertions"] = asarray([list(e.insertion) for e in elements], dtype=float).reshape(-1, 3)
+    arrays["element_aabbs"] = _box_rows([e._aabb for e in elements])
+    arrays["element_oobbs"] = _box_rows([e._oobb for e in elements])
+
+    # --------------------------------------------------------------------------
+    # hierarchy - the nodes in depth-first order, the parent and the element by row
+    # --------------------------------------------------------------------------
+    node_parents, node_elements, node_names = [], [], []
+    node_attributes, node_geometry = {}, {}
+    stack = [(model.hierarchy.root, -1)]
+    while stack:
+        node, parent = stack.pop()
+        index = len(node_parents)
+        node_parents.append(parent)
+        node_names.append(node.name if node.name is None else str(node.name))
+        if node._attributes:
+            node_attributes[index] = node._attributes
+        if node._children is None:
+            node_elements.append(rows.get(str(node.element.guid), -1) if node.element is not None else -1)
+        else:
+            node_elements.append(-2)
+            if node._my_object is not None:
+                node_geometry[index] = node._my_object
+            stack.extend((child, index) for child in reversed(node._children))
+
+    arrays["node_parents"] = asarray(node_parents, dtype=int)
+    arrays["node_elements"] = asarray(node_elements, dtype=int)
+
+    # --------------------------------------------------------------------------
+    # interactions - the edges by rows, the interface polygons and joints in buffers
+    # --------------------------------------------------------------------------
+    graph = model.interactions
+    edges, weights, edge_polygon_counts, edge_has_joints = [], [], [], []
+    polygon_points, polygon_counts, polygon_faces = [], [], []
+    joint_frames, joint_areas = [], []
+    edge_attributes = {}
+    for u in graph.edge:
+        for v, attributes in graph.edge[u].items():
+            index = len(edges)
+            edges.append([rows[u], rows[v]])
+            attributes = dict(attributes)
+            weight = attributes.pop("weight", None)
+            weights.append(nan if weight is None else weight)
+
+            polygons = attributes.get("geometry")
+            faces = attributes.get("faces")
+            joints = attributes.get("joints")
+            is_columnar = isinstance(polygons, list) and all(type(p) is Polygon for p in polygons)
+            is_columnar = is_columnar and (faces is None or len(faces) == len(polygons))
+            has_joints = is_columnar and joints is not None and len(joints) == len(polygons)
+            has_joints = has_joints and all(
+                j.type == JOINT_NAME.FACE_TO_FACE and not j.forces and not j.toolpaths for j in joints
+            )
+            if is_columnar and (joints is None or has_joints):
+                attributes.pop("geometry")
+                attributes.pop("faces", None)
+                attributes.pop("joints", None)
+                for i, polygon in enumerate(polygons):
+                    polygon_points.extend([list(p) for p in polygon.points])
+                    polygon_counts.append(len(polygon.points))
+                    polygon_faces.append(list(faces[i]) if faces is not None else [-1, -1])
+                    if has_joints:
+                        joint = joints[i]
+                        joint_frames.append([joint.frame.point, joint.frame.xaxis, joint.frame.yaxis])
+                        joint_areas.append(joint.surface_area)
+                edge_polygon_counts.append(len(polygons))
+                edge_has_joints.append(has_joints)
+            else:
+                edge_polygon_counts.append(0)
+                edge_has_joints.append(False)
+            if attributes:
+                edge_attributes[index] = attributes
+
+    arrays["edges"] = asarray(edges, dtype=int).reshape(-1, 2)
+    arrays["edge_weights"] = asarray(weights, dtype=float)
+    arrays["edge_polygon_offsets"] = _offsets(edge_polygon_counts)
+    arrays["edge_has_joints"] = asarray(edge_has_joints, dtype=bool)
+    arrays["polygon_points"] = asarray(polygon_points, dtype=float).reshape(-1, 3)
+    arrays["polygon_offsets"] = _offsets(polygon_counts)
+    arrays["polygon_faces"] = asarray(polygon_faces, dtype=int).reshape(-1, 2)
+    arrays["joint_frames"] = asarray(joint_frames, dtype=float).reshape(-1, 3, 3)
+    arrays["joint_areas"] = asarray(joint_areas, dtype=float) if joint_areas else full(0, nan)
+
+    # --------------------------------------------------------------------------
+    # the small objects
+    # --------------------------------------------------------------------------
+    meta = {
+        "version": FORMAT_VERSION,
+        "name": model.name,
+        "elements": element_meta,
+        "node_names": node_names,
+        "node_attributes": [[i, a] for i, a in node_attributes.items()],
+        "node_geometry": [[i, g] for i, g in node_geometry.items()],
+        "edge_attributes": [[i, a] for i, a in edge_attributes.items()],
+    }
+    arrays["meta"] = asarray(json_dumps(meta))
+
+    (savez_compressed if compressed else savez)(filepath, **arrays)
+
+
+# ==========================================================================
+# READ
+# ==========================================================================
+
+
+def model_from_npz(filepath, cls=None):
+    """Read a model from a NumPy ``.npz`` archive, see :meth:`compas_assembly2.Model.from_npz`.
+
+    Parameters
+    ----------
+    filepath : str | file
+        The path or the open binary file of the archive.
+    cls : type, optional
+        The model class, :class:`compas_assembly2.Model` by default.
+
+    Returns
+    -------
+    :class:`compas_assembly2.Model`
+
+    """
+    from numpy import isnan, load
+    from compas_assembly2.model import ElementNode, GroupNode, Model
+
+    cls = cls or Model
+    with load(filepath, allow_pickle=False) as archive:
+        meta = json_loads(str(archive["meta"]))
+        if meta.get("version") not in (1, FORMAT_VERSION):
+            raise ValueError("Unsupported binary model version: {}".format(meta.get("version")))
+        reader = _GeometryReader(archive)
+        guids = archive["element_guids"].tolist()
+        frames = archive["element_frames"].tolist()
+        frames_global = archive["element_frames_global"].tolist()
+        insertions = archive["element_insertions"].tolist()
+        aabbs = archive["element_aabbs"]
+        oobbs = archive["element_oobbs"]
+        node_parents = archive["node_parents"].tolist()
+        node_elements = archive["node_elements"].tolist()
+        edges = archive["edges"].tolist()
+        weights = archive["edge_weights"].tolist()
+        edge_polygon_offsets = archive["edge_polygon_offsets"].tolist()
+        edge_has_joints = archive["edge_has_joints"].tolist()
+        polygon_points = archive["polygon_points"].tolist()
+        polygon_offsets = archive["polygon_offsets"].tolist()
+        polygon_faces = archive["polygon_faces"].tolist()
+        joint_frames = archive["joint_frames"].tolist()
+        joint_areas = archive["joint_areas"].tolist()
+
+    model = cls(meta["name"])
+
+    # --------------------------------------------------------------------------
+    # elements
+    # --------------------------------------------------------------------------
+    elements = []
+    classes = {}
+    for i, data in enumerate(meta["elements"]):
+        # the subclasses, e.g. Beam or Block, are made without their constructor and get the base state first
+        name = data.get("type")
+        if name not in classes:
+            classes[name] = _class_from_name(name) if name else Element
+        element_class = classes[name]
+        element = element_class.__new__(element_class)
+        Element.__init__(
+            element,
+            name=data["name"],
+            id=data["id"],
+            frame=Frame(*frames[i]),
+            insertion=Vector(*insertions[i]),
+            **data["attributes"]
+        )
+        # the geometry is new, it is assigned without the copies of the constructor
+        element.geometry_simplified = reader.decode(data["geometry_simplified"])
+        element.geometry = reader.decode(data["geometry"])
+        element._guid = uuid.UUID(guids[i])
+        element._frame_global = Frame(*frames_global[i])
+        element._aabb = _box_list(aabbs[i])
+        element._oobb = _box_list(oobbs[i])
+        element._fabrication = data["fabrication"]
+        element._structure = data["structure"]
+        for key, value in data.get("state", {}).items():
+            setattr(element, key, value)
+        model._elements[guids[i]] = element
+        model.add_interaction_node(element)
+        elements.append(element)
+
+    # --------------------------------------------------------------------------
+    # hierarchy - the nodes are appended in depth-first order, the parents come first
+    # --------------------------------------------------------------------------
+    root = model.hierarchy.root
+    root.name = meta["node_names"][0]
+    node_attributes = dict((i, a) for i, a in meta["node_attributes"])
+    node_geometry = dict((i, g) for i, g in meta["node_geometry"])
+    nodes = [root]
+    for i in range(1, len(node_parents)):
+        parent = nodes[node_parents[i]]
+        if node_elements[i] == -2:
+            node = GroupNode(
+                name=meta["node_names"][i],
+                geometry=node_geometry.get(i),
+                attributes=node_attributes.get(i),
+                parent=parent,
+                tree=parent._tree,
+            )
+        else:
+            element = elements[node_elements[i]] if node_elements[i] >= 0 else None
+            node = ElementNode(
+                name=meta["node_names"][i], element=element, attributes=node_attributes.get(i), parent=parent
+            )
+            if element is not None:
+                element.parent = parent
+        parent.children.append(node)
+        nodes.append(node)
+    if 0 in node_attributes:
+        root.attributes = node_attributes[0]
+    model.hierarchy._invalidate_index()
+
+    # the parents precede their children, so the subtree counters are summed in reverse
+    for i in range(len(nodes) - 1, 0, -1):
+        parent, node = nodes[node_parents[i]], nodes[i]
+        if isinstance(node, GroupNode):
+            parent._number_of_nodes += node._number_of_nodes + 1
+            parent._number_of_elements += node._number_of_elements
+        else:
+            parent._number_of_nodes += 1
+            parent._number_of_elements += 1
+
+    # --------------------------------------------------------------------------
+    # interactions
+    # --------------------------------------------------------------------------
+    graph = model.interactions
+    edge_attributes = dict((i, a) for i, a in meta["edge_attributes"])
+    joint_count = 0
+    for index, (i, j) in enumerate(edges):
+        attributes = {}
+        start, stop = edge_polygon_offsets[index], edge_polygon_offsets[index + 1]
+        if stop > start:
+            polygons = [
+                Polygon(polygon_points[polygon_offsets[k] : polygon_offsets[k + 1]])  # noqa: E203
+                for k in range(start, stop)
+            ]
+            attributes["geometry"] = polygons
+            attributes["faces"] = [tuple(polygon_faces[k]) for k in range(start, stop)]
+            if edge_has_joints[index]:
+                # the joints are stored in the order of the polygons, only for the edges with joints
+                first = joint_count
+                joint_count += stop - start
+                attributes["joints"] = [
+                    Joint(
+                        polygon=polygon,
+                        type=JOINT_NAME.FACE_TO_FACE,
+                        frame=Frame(*joint_frames[first + k]),
+                        surface_area=joint_areas[first + k],
+                    )
+                    for k, polygon in enumerate(polygons)
+                ]
+        if not isnan(weights[index]):
+            attributes["weight"] = weights[index]
+        attributes.update(edge_attributes.get(index, {}))
+        graph.add_edge(guids[i], guids[j], attributes)
+
+    return model
@@ -208,10 +208,52 @@ class Element(Data):
         self.attributes.update(kwargs)  # update the attributes of with the kwargs
 
         # --------------------------------------------------------------------------
-        # compute aabb and oobb, since most of the time they are used
+        # aabb and oobb are computed on the first use, or in one batch by the collision detection
+        # empty lists mark the boxes that are not computed yet
         # --------------------------------------------------------------------------
-        self.aabb(0.00)
-        self.oobb(0.00)
+        self._aabb = []
+        self._oobb = []
+
+        # --------------------------------------------------------------------------
+        # the version is bumped by every transformation, the model compares it
+        # to find the elements changed since the last interaction detection
+        # --------------------------------------------------------------------------
+        self._version = 0
+
+        # --------------------------------------------------------------------------
+        # callbacks of the models that hold the element, called after every transformation
+        # --------------------------------------------------------------------------
+        self._observers = []
+
+    @property
+    def version(self):
+        """Get the number of transformations applied to the element since it was created.
+
+        Returns
+        -------
+        int
+            The version of the element geometry.
+
+        """
+        return getattr(self, "_version", 0)
+
+    def __getstate__(self):
+        # the models that observe the element are not copied or pickled with it
+        state = super(Element, self).__getstate__()
+        state["__dict__"] = {key: value for key, value in state["__dict__"].items() if key != "_observers"}
+        return state
+
+    def _add_observer(self, observer):
+        """Call ``observer(element)`` after every transformation of the element."""
+        observers = self.__dict__.setdefault("_observers", [])
+        if observer not in observers:
+            observers.append(observer)
+
+    def _remove_observer(self, observer):
+        """Stop calling ``observer`` after the transformations of the element."""
+        observers = getattr(self, "_observers", [])
+        if observer in observers:
+            observers.remove(observer)
 
     # ==========================================================================
     # DISPLAY
@@ -717,6 +759,28 @@ class Element(Data):
         )
         return oobb_mesh
 
+    def _bounding_box_points(self, inflate=0.00):
+        """Get the geometry points used by the bounding boxes, as two lists of XYZ coordinates:
+        the points of the aabb and the oobb, and the extra points of the aabb around the Point geometries"""
+        points = []
+        extra = []
+
+        for i in range(len(self.geometry)):
+            if isinstance(self.geometry[i], Mesh):
+                points.extend(self.geometry[i].vertices_attributes("xyz"))
+            elif isinstance(self.geometry[i], Polyline):
+                points.extend([[p[0], p[1], p[2]] for p in self.geometry[i]])
+            elif isinstance(self.geometry[i], Line):
+                points.extend([list(self.geometry[i].start), list(self.geometry[i].end)])
+            elif isinstance(self.geometry[i], (Box, Pointcloud)):
+                points.extend([[p[0], p[1], p[2]] for p in self.geometry[i].points])
+            elif isinstance(self.geometry[i], Point):
+                offset = inflate + 0.001
+                x, y, z = self.geometry[i]
+                extra.extend([[x - offset, y - offset, z - offset], [x + offset, y + offset, z + offset]])
+
+        return points, extra
+
     def aabb(self, inflate=0.00):
         """Compute bounding box based on geometry geometries points"""
 
@@ -864,7 +928,8 @@ class Element(Data):
         return self._oobb
 
     def aabb_center(self, inflate=0.001):
-        points = self.aabb(inflate)
+        # a uniform inflation does not move the center, the cached box is used when there is one
+        points = self.aabb() or self.aabb(inflate)
         return Point(
             (points[0][0] + points[6][0]) / 2, (points[0][1] + points[6][1]) / 2, (points[0][2] + points[6][2]) / 2
         )
@@ -956,8 +1021,8 @@ class Element(Data):
                 self.half_size[2] = distance_point_point(box[0], box[4]) * 0.5
 
         # convert the eight points to a frame and half-size description
-        box1 = OBB(self._oobb)
-        box2 = OBB(other._oobb)
+        box1 = OBB(self.oobb())
+        box2 = OBB(other.oobb())
 
         # get sepratation plane
         def GetSeparatingPlane(RPos, axis, box1, box2):
@@ -1007,7 +1072,7 @@ class Element(Data):
         # --------------------------------------------------------------------------
         # sanity check
         # --------------------------------------------------------------------------
-        if hasattr(self, "_face_polygons"):
+        if getattr(self, "_face_polygons", None) is not None:
             return self._face_polygons
 
         if len(self.geometry) == 0:
@@ -1035,7 +1100,7 @@ class Element(Data):
         # --------------------------------------------------------------------------
         # sanity check
         # --------------------------------------------------------------------------
-        if hasattr(self, "_face_frames"):
+        if getattr(self, "_face_frames", None) is not None:
             return self._face_frames
 
         if len(self.geometry) == 0:
@@ -1073,6 +1138,54 @@ class Element(Data):
 
         return self._face_frames
 
+    @property
+    def face_table(self):
+        """Get the faces of the geometry packed in arrays, cached until the element is transformed
+
+        Returns
+        -------
+        dict
+            ``"points"`` - (v, 3) float array of the face polygon points,
+            ``"offsets"`` - (f + 1,) integer array, face ``i`` owns the points ``offsets[i]:offsets[i + 1]``,
+            ``"frames"`` - (f, 4, 3) float array of the face frame origins, x-axes, y-axes and unit normals,
+            ``"planes"`` - (f,) float array of the plane offsets, the dot product of the normal and the origin,
+            ``"bounds"`` - (f, 4) float array of the face polygons xmin, ymin, xmax, ymax in their own frames,
+            ``"local"`` - (v, 3) float array of the face polygon points in the frames of their faces.
+        """
+        # --------------------------------------------------------------------------
+        # sanity check
+        # --------------------------------------------------------------------------
+        if getattr(self, "_face_table", None) is not None:
+            return self._face_table
+
+        if len(self.geometry) == 0:
+            raise AssertionError("You must assign geometry geometry to the element")
+
+        if not isinstance(self.geometry[0], Mesh):
+            raise AssertionError("The geometry must be a mesh")
+
+        # --------------------------------------------------------------------------
+        # pack the polygons and frames, the same function builds the tables in the worker processes
+        # --------------------------------------------------------------------------
+        from compas_assembly2.algorithms import _face_table
+
+        self._face_table = _face_table(self.geometry[0].to_polygons())
+        return self._face_table
+
+    @property
+    def face_shapes(self):
+        """Get the cache of the face polygons in their own frames, filled by the face-to-face detection
+        and emptied when the element is transformed
+
+        Returns
+        -------
+        dict
+            face index - tuple of the shapely polygon and its prepared geometry
+        """
+        if getattr(self, "_face_shapes", None) is None:
+            self._face_shapes = {}
+        return self._face_shapes
+
     # def face_to_face(self, other, tmax=1e-6, amin=1e-1):
     #     """construct intefaces by intersecting coplanar mesh faces
     #     Parameters
@@ -1219,8 +1332,8 @@ class Element(Data):
 
         # deepcopy of the fabrication, and structural information
         new_instance.frame_global = self.frame_global.copy()
-        new_instance._aabb = copy.deepcopy(self.aabb())
-        new_instance._oobb = copy.deepcopy(self.oobb())
+        new_instance._aabb = copy.deepcopy(self._aabb)
+        new_instance._oobb = copy.deepcopy(self._oobb)
         new_instance._convex_hull = copy.deepcopy(self.convex_hull)
         new_instance._fabrication = copy.deepcopy(self.fabrication)
         new_instance._structure = copy.deepcopy(self.structure)
@@ -1252,19 +1365,25 @@ class Element(Data):
         for i in range(len(self.geometry)):
             self.geometry[i].transform(transformation)
 
-        # recompute the bounding-box
-        self._aabb.clear()
-        self.aabb()
+        # the faces are recomputed from the transformed geometry
+        self._face_polygons = None
+        self._face_frames = None
+        self._face_table = None
+        self._face_shapes = None
 
-        # transform the oobb and convex-hull
-        self.oobb()
-        for i in range(len(self._oobb)):
-            p = Point(self._oobb[i][0], self._oobb[i][1], self._oobb[i][2]).transformed(transformation)
-            self._oobb[i] = [p.x, p.y, p.z]
+        # the bounding-boxes are recomputed on the next use
+        self._aabb = []
+        self._oobb = []
+        self._version = self.version + 1
+
+        # transform the convex-hull, if it is already computed
+        if getattr(self, "_convex_hull", None) is not None:
+            if self._convex_hull.number_of_vertices() > 0:
+                self._convex_hull.transform(transformation)
 
-        if self.convex_hull:
-            if self.convex_hull.number_of_vertices() > 0:
-                self.convex_hull.transform(transformation)
+        # the models move the element in their spatial index and store on the next use
+        for observer in getattr(self, "_observers", ()):
+            observer(self)
 
     def transformed(self, transformation):
         """
@@ -1,5 +1,6 @@
 from compas.data import Data
-from compas.geometry import Point, Line, centroid_points_weighted
+from compas.geometry import Frame, Point, Line, centroid_points_weighted
+from compas_assembly2 import JOINT_NAME
 
 
 class Joint(Data):
@@ -36,6 +37,25 @@ class Joint(Data):
     # CONSTRUCTOR OVERLAODING
     # ==========================================================================
 
+    @classmethod
+    def from_face_to_face(cls, polygon, face_frame):
+        """Construct a face-to-face joint from an interface polygon and the frame of the face it lies on.
+
+        Parameters
+        ----------
+        polygon : :class:`compas.geometry.Polygon`
+            The interface polygon.
+        face_frame : :class:`compas.geometry.Frame`
+            The frame of the first face, its z-axis is the normal of the joint.
+
+        Returns
+        -------
+        :class:`compas_assembly2.Joint`
+
+        """
+        frame = Frame(polygon.centroid, face_frame.xaxis, face_frame.yaxis)
+        return cls(polygon=polygon, type=JOINT_NAME.FACE_TO_FACE, frame=frame, surface_area=polygon.area)
+
     # ==========================================================================
     # SERIALIZATION
     # ==========================================================================
@@ -161,3 +181,267 @@ class Joint(Data):
         p1 = position + forcevector
         p2 = position - forcevector
         return [Line(p1, p2)]
+
+
+# ==========================================================================
+# COLUMNAR STORAGE OF JOINTS
+# one row per joint, the polygon vertices of all joints are indexed by offsets
+# ==========================================================================
+
+
+class JointTable(object):
+    """A struct-of-arrays snapshot of joints: polygon vertices, frames, normals, and surface areas.
+
+    The joints of all interactions are read in one pass into contiguous NumPy arrays,
+    so equilibrium or export code can process them without looking up the edge attributes one by one.
+    The joint ``i`` owns the vertices ``vertex_offsets[i]:vertex_offsets[i + 1]``.
+
+    Parameters
+    ----------
+    joints : list[:class:`compas_assembly2.Joint`], optional
+        The joints, the order of the rows.
+    edges : list[tuple[str, str]], optional
+        The interaction edge of each joint, several joints can belong to the same edge.
+
+    Attributes
+    ----------
+    edges : list[tuple[str, str]]
+        The interaction edge of each row.
+    vertices : numpy.ndarray
+        A (v, 3) float array of the polygon vertices of all joints.
+    vertex_offsets : numpy.ndarray
+        An (n + 1,) integer array of the first vertex of each joint.
+    frames : numpy.ndarray
+        An (n, 4, 3) float array of the frame origins, x-axes, y-axes, and z-axes.
+    areas : numpy.ndarray
+        An (n,) float array of the surface areas.
+    forces : numpy.ndarray
+        A (v, 4) float array of the ``c_np``, ``c_nn``, ``c_u``, ``c_v`` force components at the vertices.
+    force_mask : numpy.ndarray
+        A (v,) boolean array of the vertices with forces.
+
+    Examples
+    --------
+    >>> from compas.geometry import Frame, Polygon
+    >>> polygon = Polygon([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]])
+    >>> table = JointTable([Joint.from_face_to_face(polygon, Frame.worldXY())], [("a", "b")])
+    >>> len(table), table.vertices.shape, table.areas.tolist(), table.normals.tolist()
+    (1, (4, 3), [1.0], [[0.0, 0.0, 1.0]])
+    >>> table.rows(("b", "a"))
+    [0]
+    >>> table[0].forces = [{"c_np": 2.0, "c_nn": 0.0, "c_u": 0.0, "c_v": 0.0}] * 4
+    >>> table.update_forces()
+    >>> rows, starts, ends = table.resultant_forces()
+    >>> rows.tolist(), starts.tolist(), ends.tolist()
+    ([0], [[0.5, 0.5, 4.0]], [[0.5, 0.5, -4.0]])
+
+    """
+
+    def __init__(self, joints=None, edges=None):
+        from numpy import zeros
+
+        self._joints = []
+        self._rows = {}
+        self.edges = []
+        self.vertices = zeros((0, 3))
+        self.vertex_offsets = zeros(1, dtype=int)
+        self.frames = zeros((0, 4, 3))
+        self.areas = zeros(0)
+        self.forces = zeros((0, 4))
+        self.force_mask = zeros(0, dtype=bool)
+
+        if joints:
+            self._build(list(joints), list(edges) if edges is not None else [None] * len(joints))
+
+    @classmethod
+    def from_model(cls, model):
+        """Collect the joints stored in the ``joints`` attribute of the interactions of a model.
+
+        Parameters
+        ----------
+        model : :class:`compas_assembly2.Model`
+
+        Returns
+        -------
+        :class:`compas_assembly2.JointTable`
+
+        """
+        joints, edges = [], []
+        graph = model.interactions
+        for u in graph.edge:
+            for v, attributes in graph.edge[u].items():
+                for joint in attributes.get("joints") or []:
+                    joints.append(joint)
+                    edges.append((u, v))
+        return cls(joints, edges)
+
+    def _build(self, joints, edges):
+        from numpy import asarray, concatenate, cumsum
+
+        self._joints = joints
+        self.edges = edges
+        self._rows = {}
+        for i, edge in enumerate(edges):
+            if edge is not None:
+                self._rows.setdefault(frozenset(edge), []).append(i)
+
+        vertices, counts = [], []
+        for joint in joints:
+            points = [list(point) for point in joint.polygon.points] if joint.polygon else []
+            vertices.extend(points)
+            counts.append(len(points))
+        self.vertices = asarray(vertices, dtype=float).reshape(-1, 3)
+        self.vertex_offsets = concatenate([[0], cumsum(counts, dtype=int)])
+
+        self.frames = asarray(
+            [[joint.frame.point, joint.frame.xaxis, joint.frame.yaxis, joint.frame.zaxis] for joint in joints],
+            dtype=float,
+        ).reshape(-1, 4, 3)
+        self.areas = asarray(
+            [joint.surface_area if joint.surface_area is not None else 0.0 for joint in joints], dtype=float
+        )
+        self.update_forces()
+
+    def update_forces(self):
+        """Read the forces of the joints again, e.g. after an equilibrium solver assigned them."""
+        from numpy import zeros
+
+        self.forces = zeros((len(self.vertices), 4))
+        self.force_mask = zeros(len(self.vertices), dtype=bool)
+        for i, joint in enumerate(self._joints):
+            if not joint.forces:
+                continue
+            start, stop = self.vertex_offsets[i], self.vertex_offsets[i + 1]
+            count = min(stop - start, len(joint.forces))
+            self.forces[start : start + count] = [  # noqa: E203
+                [f["c_np"], f["c_nn"], f["c_u"], f["c_v"]] for f in joint.forces[:count]
+            ]
+            self.force_mask[start : start + count] = True  # noqa: E203
+
+    # ==========================================================================
+    # properties
+    # ==========================================================================
+
+    def __len__(self):
+        return len(self._joints)
+
+    def __getitem__(self, index):
+        return self._joints[index]
+
+    def __iter__(self):
+        return iter(self._joints)
+
+    def __repr__(self):
+        return "<JointTable with {} joints, {} vertices>".format(len(self._joints), len(self.vertices))
+
+    @property
+    def origins(self):
+        """(n, 3) float array of the frame origins, the polygon centroids of the face-to-face joints."""
+        return self.frames[:, 0]
+
+    @property
+    def normals(self):
+        """(n, 3) float array of the frame z-axes."""
+        return self.frames[:, 3]
+
+    # ==========================================================================
+    # access
+    # ==========================================================================
+
+    def rows(self, edge):
+        """Get the rows of the joints of an interaction edge, in either direction."""
+        return list(self._rows.get(frozenset(edge), []))
+
+    def vertices_of(self, index):
+        """Get the (v, 3) array view of the polygon vertices of the joint at a row."""
+        start, stop = self.vertex_offsets[index], self.vertex_offsets[index + 1]
+        return self.vertices[start:stop]
+
+    def vertex_rows(self):
+        """Get the (v,) integer array of the joint row of every vertex."""
+        from numpy import arange, diff, repeat
+
+        return repeat(arange(len(self._joints)), diff(self.vertex_offsets))
+
+    # ==========================================================================
+    # forces - the lines of all joints are returned as stacked start and end points
+    # ==========================================================================
+
+    def contact_force_lines(self, sign=0):
+        """Get the lines of the normal forces at the vertices of all joints, see :attr:`Joint.contact_forces`.
+
+        Parameters
+        ----------
+        sign : int, optional
+            0 for all the forces, 1 for the compression forces only, -1 for the tension forces only.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The (k,) joint rows, and the (k, 3) start and end points of the lines.
+        """
+        rows = self.vertex_rows()
+        normal = self.forces[:, 0] - self.forces[:, 1]
+        mask = self.force_mask.copy()
+        if sign > 0:
+            mask &= normal > 0
+        elif sign < 0:
+            mask &= normal < 0
+        rows = rows[mask]
+        vectors = self.frames[rows, 3] * (normal[mask] * 0.5)[:, None]
+        points = self.vertices[mask]
+        return rows, points + vectors, points - vectors
+
+    def compression_force_lines(self):
+        """Get the lines of the positive normal forces of all joints, see :meth:`contact_force_lines`."""
+        return self.contact_force_lines(1)
+
+    def tension_force_lines(self):
+        """Get the lines of the negative normal forces of all joints, see :meth:`contact_force_lines`."""
+        return self.contact_force_lines(-1)
+
+    def friction_force_lines(self):
+        """Get the lines of the in-plane forces at the vertices of all joints, see :attr:`Joint.friction_forces`.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The (k,) joint rows, and the (k, 3) start and end points of the lines.
+        """
+        mask = self.force_mask
+        rows = self.vertex_rows()[mask]
+        forces = self.forces[mask]
+        vectors = (self.frames[rows, 1] * forces[:, 2:3] + self.frames[rows, 2] * forces[:, 3:4]) * 0.5
+        points = self.vertices[mask]
+        return rows, points + vectors, points - vectors
+
+    def resultant_forces(self):
+        """Get the resultant force line of every joint with forces, see :attr:`Joint.resultant_force`.
+
+        The line passes through the centroid of the vertices weighted by the normal forces,
+        it is NaN for the joints whose normal forces sum to zero.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+            The (k,) joint rows, and the (k, 3) start and end points of the lines.
+        """
+        from numpy import bincount, errstate, flatnonzero, stack
+
+        # the sums per joint, the vertices without forces add zeros
+        vertex_rows = self.vertex_rows()
+        n = len(self._joints)
+        rows = flatnonzero(bincount(vertex_rows[self.force_mask], minlength=n))
+        normal = (self.forces[:, 0] - self.forces[:, 1]) * self.force_mask
+        sum_n = bincount(vertex_rows, weights=normal, minlength=n)[rows]
+        sum_u = bincount(vertex_rows, weights=self.forces[:, 2] * self.force_mask, minlength=n)[rows]
+        sum_v = bincount(vertex_rows, weights=self.forces[:, 3] * self.force_mask, minlength=n)[rows]
+        weighted = stack(
+            [bincount(vertex_rows, weights=self.vertices[:, i] * normal, minlength=n)[rows] for i in range(3)], axis=1
+        )
+        with errstate(divide="ignore", invalid="ignore"):
+            position = weighted / sum_n[:, None]
+
+        frames = self.frames[rows]
+        vectors = (frames[:, 3] * sum_n[:, None] + frames[:, 1] * sum_u[:, None] + frames[:, 2] * sum_v[:, None]) * 0.5
+        return rows, position + vectors, position - vectors
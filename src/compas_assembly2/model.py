@@ -7,11 +7,72 @@ from compas.datastructures import Graph
 from compas.geometry import Line, Polygon, distance_point_point  # noqa: F401
 from compas_assembly2 import Element  # noqa: F401
 from compas_assembly2 import Algorithms  # noqa: F401
+from compas_assembly2 import BVH
+from compas_assembly2 import ElementStore
+from compas_assembly2 import Joint, JointTable
+from compas_assembly2 import InteractionAdjacency
 from compas.data import Data
 from compas.datastructures import Mesh
 import uuid
 
 
+def _element_tree(node):
+    """Get the ElementTree of a node, or None when the node is not part of one."""
+    tree = getattr(node, "_tree", None)
+    return tree if isinstance(tree, ElementTree) else None
+
+
+def _set_tree(node, tree):
+    """Set the tree of a node and its descendants, when the subtree is attached or detached.
+    The nodes of a subtree share one tree, so a subtree whose root and first child already have it is skipped."""
+    if node._tree is tree and (not node._children or node._children[0]._tree is tree):
+        return
+    for descendant in node.traverse():
+        descendant._tree = tree
+
+
+def _index_add(parent, node):
+    """Add a node attached to the parent to the lookup tables of the ElementTree."""
+    tree = _element_tree(parent)
+    if tree is not None:
+        tree._add_to_index(node)
+
+
+def _index_remove(parent, node):
+    """Remove a node detached from the parent from the lookup tables of the ElementTree."""
+    tree = _element_tree(parent)
+    if tree is not None:
+        tree._remove_from_index(node)
+
+
+def _subtree_size(node):
+    """Get the number of nodes and element nodes of a subtree, including its root, as attached to a parent."""
+    if isinstance(node, GroupNode):
+        return node._number_of_nodes + 1, node._number_of_elements
+    if isinstance(node, ElementNode):
+        return 1, 1
+    nodes = list(node.traverse())
+    return len(nodes), sum(1 for n in nodes if isinstance(n, ElementNode))
+
+
+def _update_counters(node, nodes, elements):
+    """Add the number of nodes and element nodes to the counters of a group and of all its ancestors."""
+    while node is not None:
+        if isinstance(node, GroupNode):
+            node._number_of_nodes += nodes
+            node._number_of_elements += elements
+        node = node._parent
+
+
+def _is_descendant(node, ancestor):
+    """Check if the ancestor is on the parent chain of the node."""
+    while node is not None:
+        if node is ancestor:
+            return True
+        node = node._parent
+    return False
+
+
 class Node(Data):
     """A node of a tree data structure.
 
@@ -59,17 +120,54 @@ class Node(Data):
         "required": ["name", "my_object", "attributes", "children"],
     }
 
+    # the node properties are stored in slots, the containers are allocated on the first use
+    # Data keeps only its own guid and name in the instance dictionary
+    __slots__ = ["_my_object", "_attributes", "_parent", "_children", "_tree", "_composition"]
+
     def __init__(self, name=None, my_object=None, attributes=None):
         super(Node, self).__init__(name=name)
         self._my_object = my_object  # added by Petras
-        self.attributes = attributes or {}
+        self._attributes = attributes or None
         self._parent = None
-        self._children = []
+        self._children = None
         self._tree = None
+        self._composition = None
 
     def __repr__(self):
         return "<Node {}>".format(self.name)
 
+    def __getstate__(self):
+        state = super(Node, self).__getstate__()
+        names = [name for cls in type(self).__mro__ for name in cls.__dict__.get("__slots__", [])]
+        state["__slots__"] = {name: getattr(self, name) for name in names}
+        return state
+
+    def __setstate__(self, state):
+        super(Node, self).__setstate__(state)
+        for name, value in state.get("__slots__", {}).items():
+            setattr(self, name, value)
+
+    @property
+    def attributes(self):
+        if self._attributes is None:
+            self._attributes = {}
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes):
+        self._attributes = attributes
+
+    @property
+    def composition(self):
+        """The methods to edit the hierarchy below this node, created on the first use."""
+        if self._composition is None:
+            self._composition = Composition(self, None if self._tree is None else self._tree._model)
+        return self._composition
+
+    @composition.setter
+    def composition(self, composition):
+        self._composition = composition
+
     @property
     def is_root(self):
         return self._parent is None
@@ -88,14 +186,19 @@ class Node(Data):
 
     @property
     def children(self):
+        if self._children is None:
+            self._children = []
         return self._children
 
     @property
     def tree(self):
-        if self.is_root:
-            return self._tree
-        else:
-            return self.parent.tree
+        # the tree is set when the node is attached, the parents are only walked for nodes built by hand
+        if self._tree is None and self._parent is not None:
+            root = self._parent
+            while root._tree is None and root._parent is not None:
+                root = root._parent
+            self._tree = root._tree
+        return self._tree
 
     @property  # added by Petras
     def my_object(self):
@@ -139,8 +242,11 @@ class Node(Data):
         """
         if not isinstance(node, Node):
             raise TypeError("The node is not a Node object.")
-        if node not in self._children:
+        if node not in self.children:
             self._children.append(node)
+            _set_tree(node, self._tree)
+            _index_add(self, node)
+            _update_counters(self, *_subtree_size(node))
         node._parent = self
 
     def remove(self, node):
@@ -158,6 +264,10 @@ class Node(Data):
 
         """
         self._children.remove(node)
+        _index_remove(self, node)
+        nodes, elements = _subtree_size(node)
+        _update_counters(self, -nodes, -elements)
+        _set_tree(node, None)
         node._parent = None
 
     @property
@@ -169,15 +279,18 @@ class Node(Data):
 
     @property
     def descendants(self):
-        for child in self.children:
-            yield child
-            for descendant in child.descendants:
-                yield descendant
+        nodes = self.traverse()
+        next(nodes)
+        for node in nodes:
+            yield node
 
-    def traverse(self, strategy="depthfirst", order="preorder"):
+    def traverse(self, strategy="depthfirst", order="preorder", node_type=None, max_depth=None):
         """
         Traverse the tree from this node.
 
+        The walk uses an explicit stack, or a queue for the breadth-first order,
+        so its cost is linear in the number of nodes and it is not limited by the recursion depth.
+
         Parameters
         ----------
         strategy : {"depthfirst", "breadthfirst"}, optional
@@ -188,6 +301,13 @@ class Node(Data):
             The traversal order. This parameter is only used for depth-first traversal.
             Default is ``"preorder"``.
 
+        node_type : type, optional
+            Yield only the nodes of this type, e.g. :class:`ElementNode` or :class:`GroupNode`.
+            The leaves are not visited when only the nodes with children can match.
+
+        max_depth : int, optional
+            Do not go deeper than this number of levels below this node, 0 yields only this node.
+
         Yields
         ------
         :class:`~compas.datastructures.Node`
@@ -201,26 +321,53 @@ class Node(Data):
 
         """
         if strategy == "depthfirst":
-            if order == "preorder":
-                yield self
-                for child in self.children:
-                    for node in child.traverse(strategy, order):
-                        yield node
-            elif order == "postorder":
-                for child in self.children:
-                    for node in child.traverse(strategy, order):
-                        yield node
-                yield self
-            else:
+            if order not in ("preorder", "postorder"):
                 raise ValueError("Unknown traversal order: {}".format(order))
-        elif strategy == "breadthfirst":
-            queue = [self]
+        elif strategy != "breadthfirst":
+            raise ValueError("Unknown traversal strategy: {}".format(strategy))
+
+        # the element nodes have no children, skip them when only groups are yielded
+        groups_only = node_type is not None and issubclass(node_type, GroupNode)
+
+        def children(node, depth):
+            if not node._children or (max_depth is not None and depth >= max_depth):
+                return []
+            if groups_only:
+                return [child for child in node._children if isinstance(child, GroupNode)]
+            return node._children
+
+        def matches(node):
+            return node_type is None or isinstance(node, node_type)
+
+        if strategy == "breadthfirst":
+            from collections import deque
+
+            queue = deque([(self, 0)])
             while queue:
-                node = queue.pop(0)
-                yield node
-                queue.extend(node.children)
+                node, depth = queue.popleft()
+                if matches(node):
+                    yield node
+                queue.extend((child, depth + 1) for child in children(node, depth))
+
+        elif order == "preorder":
+            stack = [(self, 0)]
+            while stack:
+                node, depth = stack.pop()
+                if matches(node):
+                    yield node
+                stack.extend((child, depth + 1) for child in reversed(children(node, depth)))
+
         else:
-            raise ValueError("Unknown traversal strategy: {}".format(strategy))
+            # a node is yielded when it is popped the second time, after all its children
+            stack = [(self, 0, False)]
+            while stack:
+                node, depth, visited = stack.pop()
+                if visited:
+                    if matches(node):
+                        yield node
+                    continue
+                stack.append((node, depth, True))
+                stack.extend((child, depth + 1, False) for child in reversed(children(node, depth)))
 
 
 class Tree(Data):
@@ -376,7 +523,7 @@ class Tree(Data):
         """
         if node == self.root:
             self._root = None
-            node._tree = None
+            _set_tree(node, None)
         else:
             node.parent.remove(node)
 
@@ -386,9 +533,9 @@ class Tree(Data):
             if node.is_leaf:
                 yield node
 
-    def traverse(self, strategy="depthfirst", order="preorder"):
+    def traverse(self, strategy="depthfirst", order="preorder", node_type=None, max_depth=None):
         """
-        Traverse the tree from the root node.
+        Traverse the tree from the root node, see :meth:`Node.traverse`.
 
         Parameters
         ----------
@@ -400,6 +547,12 @@ class Tree(Data):
             The traversal order. This parameter is only used for depth-first traversal.
             Default is ``"preorder"``.
 
+        node_type : type, optional
+            Yield only the nodes of this type, e.g. :class:`ElementNode` or :class:`GroupNode`.
+
+        max_depth : int, optional
+            Do not go deeper than this number of levels below the root.
+
         Yields
         ------
         :class:`~compas.datastructures.Node`
@@ -413,7 +566,7 @@ class Tree(Data):
 
         """
         if self.root:
-            for node in self.root.traverse(strategy=strategy, order=order):
+            for node in self.root.traverse(strategy=strategy, order=order, node_type=node_type, max_depth=max_depth):
                 yield node
 
     def get_node_by_name(self, name):
@@ -457,14 +610,14 @@ class Tree(Data):
         return nodes
 
     def __repr__(self):
-        return "<Tree with {} nodes>".format(len(list(self.nodes)))
+        return "<Tree with {} nodes>".format(_subtree_size(self.root)[0] if self.root else 0)
 
     def print(self):
         """Print the spatial hierarchy of the tree."""
 
         def _print(node, depth=0):
             print("  " * depth + str(node))
-            for child in node.children:
+            for child in node.children or []:
                 _print(child, depth + 1)
 
         _print(self.root)
@@ -512,6 +665,7 @@ class ElementTree(Tree):
         # --------------------------------------------------------------------------
         self.name = name  # the name of the tree
         self._model = model  # variable that points to the model class
+        self._index = None  # lookup tables of the nodes, built on the first query, see _get_index
         self._root = GroupNode(name="root", geometry=None, attributes=None, parent=None, tree=self)
 
         # --------------------------------------------------------------------------
@@ -572,19 +726,72 @@ class ElementTree(Tree):
 
     @property
     def number_of_elements(self):
-        # iterate all children and count ElementNode
-        count = 0
+        # the counter of the element nodes below the root
+        return self.root._number_of_elements
 
-        def _count_elements(node, count):
-            for child in node.children:
-                if isinstance(child, ElementNode):
-                    count += 1
-                else:
-                    count = _count_elements(child, count)
-            return count
+    # ==========================================================================
+    # lookup tables: element guid - ElementNode, node name - list of nodes
+    # the parent of an element is the parent of its ElementNode
+    # ==========================================================================
+
+    def _get_index(self):
+        """Get the lookup tables, they are built by one walk of the tree after they were invalidated.
+
+        The tables follow the nodes added and removed through the tree, renaming a node afterwards is not tracked.
+        """
+        if self._index is None:
+            self._index = ({}, {})
+            self._add_to_index(self._root)
+        return self._index
+
+    def _add_to_index(self, node):
+        """Add the node and its descendants to the lookup tables, if the tables are built."""
+        if self._index is None:
+            return
+        element_nodes, nodes_by_name = self._index
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            nodes_by_name.setdefault(node.name, []).append(node)
+            if isinstance(node, ElementNode):
+                if node.element is not None:
+                    element_nodes[str(node.element.guid)] = node
+            elif node._children:
+                stack.extend(reversed(node._children))
+
+    def _remove_from_index(self, node):
+        """Remove the node and its descendants from the lookup tables, if the tables are built."""
+        if self._index is None:
+            return
+        element_nodes, nodes_by_name = self._index
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            nodes = nodes_by_name.get(node.name, [])
+            if node in nodes:
+                nodes.remove(node)
+                if not nodes:
+                    del nodes_by_name[node.name]
+            if isinstance(node, ElementNode):
+                if node.element is not None and element_nodes.get(str(node.element.guid)) is node:
+                    del element_nodes[str(node.element.guid)]
+            elif node._children:
+                stack.extend(node._children)
+
+    def _invalidate_index(self):
+        """Drop the lookup tables after an edit that rearranges many nodes, they are rebuilt on the next query."""
+        self._index = None
+
+    def get_element_node(self, guid):
+        """Get the ElementNode of an element by the element guid, or None."""
+        return self._get_index()[0].get(str(guid))
 
-        count = _count_elements(self.root, count)
-        return count
+    def get_node_by_name(self, name):
+        nodes = self._get_index()[1].get(name)
+        return nodes[0] if nodes else None
+
+    def get_nodes_by_name(self, name):
+        return list(self._get_index()[1].get(name, []))
 
     # ==========================================================================
     # hierarchy methods: add Node, add_by_path
@@ -614,7 +821,7 @@ class ElementTree(Tree):
             # Get a string representation of the ElementTree
             tree_repr = repr(model_tree)
         """
-        return "ElementTree with {} nodes".format(len(list(self.nodes)))
+        return "ElementTree with {} nodes".format(self.root._number_of_nodes + 1)
 
     def __str__(self):
         return self.__repr__()
@@ -676,6 +883,9 @@ class ElementTree(Tree):
 
 
 class GroupNode(Node):
+    # the sizes of the subtree below the group, updated when nodes are attached or detached
+    __slots__ = ["_number_of_nodes", "_number_of_elements"]
+
     def __init__(self, name=None, geometry=None, attributes=None, parent=None, tree=None):
         """
         Initialize a Node.
@@ -695,6 +905,9 @@ class GroupNode(Node):
         super().__init__(name=name, my_object=geometry, attributes=attributes)
         self.name = name if name else str(self.guid)
         self._parent = parent
+        self._children = []
+        self._number_of_nodes = 0
+        self._number_of_elements = 0
 
         if tree is not None:
             self._tree = tree
@@ -702,11 +915,8 @@ class GroupNode(Node):
             self._tree = parent._tree
         # --------------------------------------------------------------------------
         # user input - add elements to the current node and base tree model, if it exists
+        # the composition is created on the first use, see Node.composition
         # --------------------------------------------------------------------------
-        reference_to_the_model = (
-            None if self._tree is None else self._tree._model
-        )  # for cases when the node is initialized separately
-        self.composition = Composition(self, reference_to_the_model)
 
     # ==========================================================================
     # Serialization
@@ -758,9 +968,24 @@ class GroupNode(Node):
         """
         return self._children
 
+    @property
+    def number_of_nodes(self):
+        """Get the number of nodes below the group, kept up to date when nodes are added or removed."""
+        return self._number_of_nodes
+
+    @property
+    def number_of_elements(self):
+        """Get the number of element nodes below the group, kept up to date when nodes are added or removed."""
+        return self._number_of_elements
+
     def clear_children(self):
         if self.composition.base_node._children:
-            self.composition.base_node._children.clear()
+            base_node = self.composition.base_node
+            _update_counters(base_node, -base_node._number_of_nodes, -base_node._number_of_elements)
+            base_node._children.clear()
+            tree = _element_tree(self)
+            if tree is not None:
+                tree._invalidate_index()
 
     # ==========================================================================
     # less than to add elements to the SortedList
@@ -793,9 +1018,7 @@ class GroupNode(Node):
             # Change the base tree of the current node
             node.change_base_tree(new_tree)
         """
-        self._tree = new_tree
-        for child in self._children:
-            child.change_base_tree(new_tree)
+        _set_tree(self, new_tree)
 
     # ==========================================================================
     # interactions properties and methods - self._interactions = Graph()
@@ -831,6 +1054,8 @@ class GroupNode(Node):
 
 
 class ElementNode(Node):
+    __slots__ = []
+
     def __init__(self, name=None, element=None, attributes=None, parent=None):
         """
         Initialize a Node.
@@ -854,8 +1079,8 @@ class ElementNode(Node):
         if parent is not None:
             self._tree = parent._tree
         # --------------------------------------------------------------------------
-        reference_to_the_model = None if self._tree is None else self._tree._model
-        self.composition = Composition(self, reference_to_the_model)
+        # the composition is created on the first use, see Node.composition
+        # --------------------------------------------------------------------------
 
     # ==========================================================================
     # Serialization
@@ -884,6 +1109,11 @@ class ElementNode(Node):
     def element(self):
         return self._my_object
 
+    @property
+    def children(self):
+        """An element node is a leaf, it has no list of children."""
+        return self._children
+
     # ==========================================================================
     # less than to add elements to the SortedList
     # ==========================================================================
@@ -960,12 +1190,9 @@ class Composition:
             name = name if name else str(element_copy.guid)
 
             # if the node is part of a tree, then add elements to the base dictionary of Model class
+            # the graph node and the spatial index of the Model are updated as well
             if self.base_node._tree:
-                # update the root class
-                self.base_node._tree._model._elements[str(element_copy.guid)] = element_copy
-
-                # add the node to the graph
-                self.base_node._tree._model.add_interaction_node(element_copy)
+                self.base_node._tree._model._register_element(element_copy)
 
             element_node = ElementNode(name=name, element=element_copy, attributes=attributes, parent=parent)
             self.add_node(element_node)
@@ -1007,6 +1234,10 @@ class Composition:
             raise TypeError("The node is not a Node object.")
         if node not in self.base_node._children:
             self.base_node._children.append(node)
+            node._parent = self.base_node
+            _set_tree(node, self.base_node._tree)
+            _index_add(self.base_node, node)
+            _update_counters(self.base_node, *_subtree_size(node))
             # print("____", self.base_node, type(self.base_node))
             # print("____", self.base_node._tree)
             if self.base_node._tree is not None:
@@ -1039,33 +1270,53 @@ class Composition:
         # collect all the elements from the node
         all_elements = self.collect_elements(node)
 
-        # remove the elements from the dictionary and the graph
+        # remove the elements from the dictionary, the graph, and the spatial index
         for element in all_elements:
-            del self.base_node.tree._model._elements[str(element.guid)]
-            self.base_node.tree._model._interactions.delete_node(str(element.guid))
+            self.base_node.tree._model._unregister_element(element.guid)
 
         # remove the node from the tree
         self.base_node.remove(node)
 
     def find_node(self, node_name):
+        # lookup table of the tree
+        tree = _element_tree(self.base_node)
+        if tree is not None:
+            for node in tree._get_index()[1].get(node_name, []):
+                if node is not self.base_node and _is_descendant(node, self.base_node):
+                    return node
+            return None
+
+        # the node is not part of a tree, search all the branches
         def _find_node(node):
-            for child in node.children:
+            for child in node.children or []:
                 if child.name == node_name:
                     return child
-                else:
-                    return _find_node(child)
+                found = _find_node(child)
+                if found is not None:
+                    return found
             return None
 
         return _find_node(self.base_node)
 
     def find_element_node(self, element):
+        # lookup table of the tree
+        tree = _element_tree(self.base_node)
+        if tree is not None:
+            node = tree.get_element_node(element.guid)
+            if node is not None and node.element is element and _is_descendant(node, self.base_node):
+                return node
+            return None
+
+        # the node is not part of a tree, search all the branches
         def _find_element_node(node):
-            for child in node.children:
+            for child in node.children or []:
                 if isinstance(child, ElementNode):
                     if child.element == element:
                         return child
                 else:
-                    return _find_element_node(child)
+                    found = _find_element_node(child)
+                    if found is not None:
+                        return found
             return None
 
         return _find_element_node(self.base_node)
@@ -1074,14 +1325,13 @@ class Composition:
         if not isinstance(element, Element):
             raise TypeError("The element is not an Element object.")
 
-        # remove the elements from the dictionary and the graph
-        del self.base_node.tree._model._elements[str(element.guid)]
-        self.base_node.tree._model._interactions.delete_node(str(element.guid))
+        # remove the elements from the dictionary, the graph, and the spatial index
+        self.base_node.tree._model._unregister_element(element.guid)
 
-        # find and remove the node from the tree
+        # find and remove the node from its parent
         found_node = self.find_element_node(element)
         if found_node:
-            self.base_node.remove(found_node)
+            found_node.parent.remove(found_node)
 
     def insert_node(self, node, node_names=[]):
         pass
@@ -1111,6 +1361,10 @@ class Composition:
     def merge(self, other_model):
         """merge current model with the other model"""
 
+        def move_node(parent, node):
+            # the moved node is attached to this tree, so it is found by the lookup tables
+            parent.composition.add_node(node)
+
         def add_nodes(curr_node, other_node):
             # try to find GroupNode with the same name
             print("curr_node", curr_node.name, "other_node", other_node.name)
@@ -1123,7 +1377,7 @@ class Composition:
                     if curr_child.name == other_child.name:
                         is_found = True
                         if isinstance(curr_child, ElementNode) and isinstance(other_child, ElementNode):
-                            curr_child.parent.composition.add_node(other_child)
+                            move_node(curr_child.parent, other_child)
                         elif isinstance(curr_child, GroupNode) and isinstance(other_child, GroupNode):
                             # merge the nodes
                             print(curr_child.name, other_child.name)
@@ -1134,7 +1388,7 @@ class Composition:
 
             # add non intersecting nodes
             for other_child in non_intersecting_nodes:
-                curr_node.composition.add_node(other_child)
+                move_node(curr_node, other_child)
                 print("adding", other_child.name)
 
         add_nodes(self.base_node, other_model._hierarchy.root)  # type: ignore
@@ -1142,7 +1396,7 @@ class Composition:
         # add elements to the dictionary
         print("other_model.elements", other_model.elements)
         for key, item in other_model.elements.items():
-            self.base_node._tree._model._elements[key] = item
+            self.base_node._tree._model._register_element(item)
 
         # add graph nodes
         for node in other_model._interactions.nodes():
@@ -1151,6 +1405,7 @@ class Composition:
         # add graph edges
         for edge in other_model._interactions.edges():
             self.base_node._tree._model._interactions.add_edge(edge[0], edge[1])
+        self.base_node._tree._model._adjacency = None
 
     def flatten(self, flatenned_node_name="flat_node"):
         """flatten the hierarchy structure"""
@@ -1186,16 +1441,20 @@ class Composition:
                         name = child.name
                         element = child.element
                         parent = child.parent
-                        group = GroupNode(name=name, geometry=None, attributes=child.attributes)
+                        group = GroupNode(name=name, geometry=None, attributes=child.attributes, parent=parent)
                         node.children[idx] = group
-                        group._parent = parent
-                        group._tree = parent._tree
+                        _update_counters(node, 0, -1)
                         group.add_element(name=name, element=element)
                     else:
                         _graft_node(self, child)
 
         _graft_node(self, self.base_node)
 
+        # the element nodes moved to new groups
+        tree = _element_tree(self.base_node)
+        if tree is not None:
+            tree._invalidate_index()
+
     def prune(self, level=0):
         # Prune the tree by moving elements from child nodes to parent nodes and deleting child nodes.
         if level == 0:
@@ -1265,21 +1524,26 @@ class Composition:
 
         get_elements(all_elements, node)
 
-        # remove elements from the element dictionary and the graph
+        # remove elements from the element dictionary, the graph, and the spatial index
         for element in all_elements:
-            del self.base_node._tree.model._elements[str(element.guid)]
-            self.base_node._tree.model._interactions.delete_node(str(element.guid))
+            self.base_node._tree.model._unregister_element(element.guid)
 
-        # replace the node
+        # replace the node, the new subtree takes the tree of the base node
         new_node._parent = node.parent
         del self.base_node._children[index]
         self.base_node._children.insert(index, new_node)
+        _index_remove(self.base_node, node)
+        _set_tree(node, None)
+        _set_tree(new_node, self.base_node._tree)
+        _index_add(self.base_node, new_node)
+        nodes, elements = _subtree_size(node)
+        _update_counters(self.base_node, -nodes, -elements)
+        _update_counters(self.base_node, *_subtree_size(new_node))
 
         # iterate of the new_node and add elements to the dictionary and the graph
         def add_elements_to_the_dictionary_and_graph(node):
             if isinstance(node, ElementNode):
-                self.base_node._tree.model._elements[str(node.element.guid)] = node.element
-                self.base_node._tree.model._interactions.add_node(str(node.element.guid))
+                self.base_node._tree.model._register_element(node.element)
                 return
 
             for child in node.children:
@@ -1304,6 +1568,15 @@ class Composition:
             self.set_child_by_index(node_index, new_node)
 
     def get_node_by_element_guid(self, guid):
+        # lookup table of the tree, the parent of the element node
+        tree = _element_tree(self.base_node)
+        if tree is not None:
+            node = tree.get_element_node(guid)
+            if node is not None and _is_descendant(node, self.base_node):
+                return node.parent
+            return None
+
+        # the node is not part of a tree, search all the branches
         def get_node(node):
 
             for child in node.children:
@@ -1322,36 +1595,55 @@ class Composition:
         return self.get_node_by_element_guid(element.guid)
 
     def set_element_by_guid(self, guid, element):
+        self.set_elements_by_guid([guid], [element])
 
-        # replaces the elements in the nodes
-        def replace_element(node):
-            for child in node.children:
-                if isinstance(child, ElementNode):
-                    if child.element.guid == guid:
-                        child._my_object = element
-                else:
-                    replace_element(child)
-
-        replace_element(self.base_node)
-
-        # delete the element from the dictionary
-        del self.base_node._tree.model._elements[str(guid)]
-        self.base_node._tree.model._elements[str(element.guid)] = element
+    def set_elements_by_guid(self, guids, elements):
+        """Replace many elements in one pass, the interactions keep their attributes.
 
-        # find edges in the graph with this node
-        edges = self.base_node._tree.model._interactions.edges()
-        new_edges = []
-        for edge in edges:
-            if edge[0] == str(guid):
-                new_edges.append((str(element.guid), edge[1]))
-            elif edge[1] == str(guid):
-                new_edges.append((edge[0], str(element.guid)))
-        self.base_node._tree.model._interactions.add_node(str(element.guid))
-        for edge in new_edges:
-            self.base_node._tree.model._interactions.add_edge(edge[0], edge[1])
-
-        # delete the node from the graph
-        self.base_node._tree.model._interactions.delete_node(str(guid))
+        Parameters
+        ----------
+        guids : list[str | uuid.UUID]
+            The GUIDs of the elements to replace.
+        elements : list[:class:`compas_assembly2.Element`]
+            The new elements, they must not be part of the model yet.
+
+        """
+        model = self.base_node._tree.model
+        tree = _element_tree(self.base_node)
+        bvh = model._bvh
+        mapping = {}
+
+        for guid, element in zip(guids, elements):
+            old_key, new_key = str(guid), str(element.guid)
+            mapping[old_key] = new_key
+
+            # replaces the element in its node and in the lookup table
+            node = tree.get_element_node(guid) if tree is not None else None
+            if node is not None:
+                tree._remove_from_index(node)
+                node._my_object = element
+                tree._add_to_index(node)
+
+            # replace the element in the dictionary, the model follows the transformations of the new one
+            model._elements.pop(old_key)._remove_observer(model._on_element_transformed)
+            model._remove_element_key(old_key)
+            model._elements[new_key] = element
+            model._add_element_key(new_key)
+            element._add_observer(model._on_element_transformed)
+
+            # replace the box in the spatial index
+            model._bvh_dirty.discard(old_key)
+            if bvh is not None:
+                if old_key in bvh:
+                    bvh.remove(old_key)
+                if element.aabb():
+                    bvh.insert(new_key, element.aabb())
+
+        # the columnar store is rebuilt on the next use
+        model._store = None
+
+        # rename the graph nodes, the edges and their attributes follow
+        model._replace_interaction_nodes(mapping)
 
     def set_element_by_element(self, existing_element, element):
         self.set_element_by_guid(existing_element.guid, element)
@@ -1496,6 +1788,17 @@ class Model(Data):
         self._elements = OrderedDict()  # a flat collection of elements - dict{GUID, Element}
         self._hierarchy = ElementTree(model=self, name=name)  # hierarchical relationships between elements
         self._interactions = Graph(name=name)  # abstract linkage or connection between elements and nodes
+        self._bvh = None  # spatial index of the element bounding-boxes, built on the first use
+        self._bvh_dirty = set()  # GUIDs of the elements transformed since their box was stored in the spatial index
+        self._store = None  # columnar snapshot of the elements, built on the first use of self.snapshot
+        self._store_dirty = set()  # GUIDs of the elements transformed since their row was stored in the snapshot
+        self._adjacency = None  # compressed sparse adjacency of the interactions, built on the first use
+        self._adjacency_counts = None  # numbers of graph nodes and stored edges the adjacency was built from
+        self._element_keys = None  # dense position - GUID list of the elements, None marks a removed element
+        self._element_slots = None  # GUID - position in self._element_keys
+        self._element_holes = 0  # number of removed elements not compacted yet
+        self._interaction_versions = {}  # GUID - element version at the last interaction detection
+        self._interaction_settings = None  # detection type and tolerances of the last interface detection
 
         # --------------------------------------------------------------------------
         # process the user input
@@ -1523,11 +1826,51 @@ class Model(Data):
     def from_data(cls, data):
         model = cls(data["name"])
         model._elements = data["elements"]
+        model._element_keys = None
         model._hierarchy = ElementTree.from_data(data["hierarchy"])
         model._hierarchy._model = model  # variable that points to the model class
         model._interactions = Graph.from_data(data["interactions"])
         return model
 
+    def to_npz(self, filepath, compressed=True):
+        """
+        Write the model to a binary NumPy ``.npz`` archive, every element is stored once.
+
+        The meshes, points, lines, and polylines of the elements, the element frames and bounding-boxes,
+        and the interface polygons and joints of the interactions are stored in flat arrays,
+        the hierarchy and the interactions refer to the elements by their position.
+        The other objects are stored in one COMPAS JSON string, among them the class of every element,
+        the data of the element subclasses such as :class:`Beam`, and the meshes that have attributes.
+
+        Parameters
+        ----------
+        filepath : str | file
+            The path or the open binary file of the archive.
+        compressed : bool, optional
+            If True, the arrays are compressed.
+        """
+        from compas_assembly2.binary import model_to_npz
+
+        model_to_npz(self, filepath, compressed)
+
+    @classmethod
+    def from_npz(cls, filepath):
+        """
+        Read a model written by :meth:`to_npz`.
+
+        Parameters
+        ----------
+        filepath : str | file
+            The path or the open binary file of the archive.
+
+        Returns
+        -------
+        :class:`Model`
+        """
+        from compas_assembly2.binary import model_from_npz
+
+        return model_from_npz(filepath, cls)
+
     # ==========================================================================
     # Key property getters
     # ==========================================================================
@@ -1581,10 +1924,224 @@ class Model(Data):
         """
         return self._interactions
 
+    @property
+    def interaction_adjacency(self):
+        """
+        Retrieve the compressed sparse adjacency of the interactions, for shortest paths and other graph queries.
+        The adjacency is built on the first call and dropped when interactions or elements are added or removed
+        through the model. Edits of :attr:`interactions` itself, e.g. ``add_edge``, ``delete_edge``, or a new
+        ``weight`` attribute, are not tracked: call :meth:`invalidate_adjacency` after them.
+        As a safety net, the adjacency is also rebuilt when the number of graph nodes or edges changed.
+
+        Returns
+        -------
+        :class:`compas_assembly2.InteractionAdjacency`
+            The neighbour and weight arrays, in the order of the graph nodes.
+        """
+        graph = self._interactions
+        counts = (len(graph.node), sum(map(len, graph.edge.values())))
+        if self._adjacency is None or self._adjacency_counts != counts:
+            self._adjacency = InteractionAdjacency(graph)
+            self._adjacency_counts = counts
+        return self._adjacency
+
+    def invalidate_adjacency(self):
+        """
+        Drop the cached adjacency of the interactions, it is rebuilt on the next use of :attr:`interaction_adjacency`.
+        Call it after editing the nodes, the edges, or the edge weights of :attr:`interactions` directly.
+        """
+        self._adjacency = None
+        self._adjacency_counts = None
+
+    @property
+    def bvh(self):
+        """
+        Retrieve the bounding-volume hierarchy of the element axis-aligned bounding-boxes.
+        The hierarchy is built on the first call and then kept up to date
+        when elements are added, removed, or the model is transformed.
+        The elements of the model report their transformations,
+        only the boxes of the elements transformed since the last call are moved.
+
+        Returns
+        -------
+        :class:`compas_assembly2.BVH`
+            The spatial index, where the keys are the element GUID strings.
+        """
+        if self._bvh is None:
+            keys = list(self._elements.keys())
+            Algorithms.inflate_bounding_boxes(list(self._elements.values()), oobb=False)
+            self._bvh = BVH.from_boxes(keys, [self._elements[key].aabb() for key in keys])
+            self._bvh_dirty.clear()
+            self._observe_elements()
+        elif self._bvh_dirty:
+            self._update_bvh()
+        return self._bvh
+
+    def _update_bvh(self):
+        """Move the boxes of the elements transformed since their box was stored in the spatial index."""
+        stale = [(key, self._elements[key]) for key in self._bvh_dirty if key in self._elements]
+        self._bvh_dirty.clear()
+        bvh = self._bvh
+        Algorithms.inflate_bounding_boxes([e for _, e in stale], oobb=False)
+        for key, e in stale:
+            if key in bvh:
+                if e.aabb():
+                    bvh.update(key, e.aabb())
+                else:
+                    bvh.remove(key)
+            elif e.aabb():
+                bvh.insert(key, e.aabb())
+
+    def _observe_elements(self):
+        """Subscribe to the transformations of all elements, also those added to the dictionary directly."""
+        for e in self._elements.values():
+            e._add_observer(self._on_element_transformed)
+
+    def _on_element_transformed(self, element):
+        """Mark the box and the snapshot row of a transformed element, they are updated on their next use."""
+        key = str(element.guid)
+        if self._elements.get(key) is not element:
+            return
+        if self._bvh is not None:
+            self._bvh_dirty.add(key)
+        if self._store is not None:
+            self._store_dirty.add(key)
+
     # ==========================================================================
     # hierarchy methods
     # ==========================================================================
 
+    @property
+    def snapshot(self):
+        """
+        Retrieve an opt-in columnar snapshot of the elements, for vectorized algorithms over the whole model.
+        The snapshot is a copy next to the elements, which remain the storage of the model,
+        so it adds to the memory of the model, it is only built on the first call.
+        It is dropped when elements are added, removed, or the model is transformed.
+        The rows of the elements transformed one by one since the last call are recomputed,
+        see :meth:`ElementStore.refresh`.
+
+        Returns
+        -------
+        :class:`compas_assembly2.ElementStore`
+            The frames, bounding-boxes, insertion vectors, and mesh buffers, in the order of the elements.
+        """
+        if self._store is None:
+            self._store = ElementStore(list(self._elements.values()))
+            self._store_dirty.clear()
+            self._observe_elements()
+        elif self._store_dirty:
+            store = self._store
+            store.refresh([store.index(key) for key in self._store_dirty if key in store])
+            self._store_dirty.clear()
+        return self._store
+
+    def _register_element(self, element):
+        """Add the element to the dictionary, the graph, and the spatial index if it is already built."""
+        key = str(element.guid)
+        self._elements[key] = element
+        self._add_element_key(key)
+        self.add_interaction_node(element)
+        self._store = None
+        element._add_observer(self._on_element_transformed)
+        if self._bvh is not None and element.aabb():
+            self._bvh.insert(key, element.aabb())
+
+    def _unregister_element(self, guid):
+        """Remove the element from the dictionary, the graph, and the spatial index."""
+        key = str(guid)
+        self._elements.pop(key)._remove_observer(self._on_element_transformed)
+        self._remove_element_key(key)
+        self._delete_interaction_node(key)
+        self._store = None
+        if self._bvh is not None and key in self._bvh:
+            self._bvh.remove(key)
+        self._bvh_dirty.discard(key)
+
+    # ==========================================================================
+    # positional access: dense index - GUID list of the elements, in the order of the dictionary
+    # removed elements leave a hole that is compacted on the next positional query
+    # ==========================================================================
+
+    def _get_element_keys(self):
+        """Get the GUID strings of the elements by position, rebuilt if the dictionary was edited directly."""
+        if self._element_keys is None or len(self._element_slots) != len(self._elements):
+            self._element_keys = list(self._elements.keys())
+            self._element_slots = {key: i for i, key in enumerate(self._element_keys)}
+            self._element_holes = 0
+        elif self._element_holes:
+            self._element_keys = [key for key in self._element_keys if key is not None]
+            self._element_slots = {key: i for i, key in enumerate(self._element_keys)}
+            self._element_holes = 0
+        return self._element_keys
+
+    def _add_element_key(self, key):
+        """Append an element GUID string to the positional index, if the index is built."""
+        if self._element_keys is not None and key not in self._element_slots:
+            self._element_slots[key] = len(self._element_keys)
+            self._element_keys.append(key)
+
+    def _remove_element_key(self, key):
+        """Leave a hole at the position of an element GUID string, if the index is built."""
+        if self._element_keys is not None:
+            slot = self._element_slots.pop(key, None)
+            if slot is not None:
+                self._element_keys[slot] = None
+                self._element_holes += 1
+
+    def element_index(self, guid):
+        """
+        Get the position of an element in the order of the elements dictionary.
+
+        Parameters
+        ----------
+        guid : str | uuid.UUID | :class:`compas_assembly2.Element`
+            The element or its GUID.
+
+        Returns
+        -------
+        int
+            The position, as used by :meth:`element_at`.
+        """
+        if isinstance(guid, Element):
+            guid = guid.guid
+        self._get_element_keys()
+        return self._element_slots[str(guid)]
+
+    def elements_at(self, indices):
+        """
+        Get the elements at many positions at once.
+
+        Parameters
+        ----------
+        indices : list[int] | numpy.ndarray
+            The positions, negative positions count from the end.
+
+        Returns
+        -------
+        list[:class:`compas_assembly2.Element`]
+            The elements in the order of the positions.
+        """
+        keys = self._get_element_keys()
+        return [self._elements[keys[i]] for i in indices]
+
+    def element_keys_at(self, indices):
+        """
+        Get the GUID strings of the elements at many positions at once.
+
+        Parameters
+        ----------
+        indices : list[int] | numpy.ndarray
+            The positions, negative positions count from the end.
+
+        Returns
+        -------
+        list[str]
+            The GUID strings in the order of the positions.
+        """
+        keys = self._get_element_keys()
+        return [keys[i] for i in indices]
+
     def contains_node(self, node_name):
         return self.composition.contains_node(node_name)
 
@@ -1635,23 +2192,97 @@ class Model(Data):
         self.composition.prune(level=level)
 
     def element_at(self, id):
-        return list(self.elements.values())[id]
+        return self._elements[self._get_element_keys()[id]]
 
     def element_key_at(self, id):
-        return list(self.elements.keys())[id]
+        return self._get_element_keys()[id]
 
     def children(self):
         return self.composition.base_node.children
 
     def clear_children(self):
-        return self.composition.base_node._children.clear()
+        self._hierarchy._invalidate_index()
+        root = self.composition.base_node
+        _update_counters(root, -root._number_of_nodes, -root._number_of_elements)
+        return root._children.clear()
 
     # ==========================================================================
     # interactions properties and methods - self._interactions = Graph()
     # ==========================================================================
     def add_interaction_node(self, element):
+        self._adjacency = None
         self._interactions.add_node(str(element.guid))
 
+    def _delete_interaction_edges(self, key):
+        """Delete the edges of a graph node through the adjacency of the node, without scanning all the edges."""
+        graph = self._interactions
+        if key not in graph.node:
+            return
+        self._adjacency = None
+        for neighbour in graph.adjacency[key]:
+            if neighbour != key:
+                del graph.adjacency[neighbour][key]
+                graph.edge[neighbour].pop(key, None)
+        graph.adjacency[key] = {}
+        graph.edge[key] = {}
+
+    def _delete_interaction_node(self, key):
+        """Delete a graph node and its edges through the adjacency of the node, without scanning all the edges."""
+        graph = self._interactions
+        if key not in graph.node:
+            return
+        self._delete_interaction_edges(key)
+        del graph.adjacency[key]
+        del graph.edge[key]
+        del graph.node[key]
+
+    def dirty_elements(self):
+        """
+        Get the elements added, replaced, or transformed since the last interaction detection.
+
+        Returns
+        -------
+        list[:class:`compas_assembly2.Element`]
+            The elements in the order of the elements dictionary.
+        """
+        versions = self._interaction_versions
+        return [e for key, e in self._elements.items() if versions.get(key) != e.version]
+
+    def _replace_interaction_nodes(self, mapping):
+        """Rename graph nodes through their adjacency, the node and edge attributes are kept.
+
+        Parameters
+        ----------
+        mapping : dict[str, str]
+            The old node keys and their new keys, the new keys must not be in the graph yet.
+        """
+        graph = self._interactions
+        self._adjacency = None
+        for old_key, new_key in mapping.items():
+            if old_key == new_key:
+                continue
+            if old_key not in graph.node:
+                graph.add_node(new_key)
+                continue
+
+            def rename(key):
+                return new_key if key == old_key else key
+
+            # the node and the edges stored from the node
+            graph.node[new_key] = graph.node.pop(old_key)
+            graph.edge[new_key] = {rename(key): data for key, data in graph.edge.pop(old_key).items()}
+            graph.adjacency[new_key] = {rename(key): None for key in graph.adjacency.pop(old_key)}
+
+            # the edges stored from the neighbours
+            for neighbour in graph.adjacency[new_key]:
+                if neighbour == new_key:
+                    continue
+                adjacency = graph.adjacency[neighbour]
+                del adjacency[old_key]
+                adjacency[new_key] = None
+                if old_key in graph.edge[neighbour]:
+                    graph.edge[neighbour][new_key] = graph.edge[neighbour].pop(old_key)
+
     def add_interaction(self, element0, element1, geometry=None):
         """
         Adds an interaction between two elements in the model.
@@ -1694,10 +2325,73 @@ class Model(Data):
                 attribute_dict["weight"] = distance_point_point(
                     user_element0.aabb_center(), user_element1.aabb_center()
                 )
+                self._adjacency = None
                 return self._interactions.add_edge(str(user_element0.guid), str(user_element1.guid), attribute_dict)
         else:
             raise ValueError("The node does not exist.")
 
+    def add_interactions(self, pairs, geometries=None):
+        """
+        Adds many interactions between elements in one pass over the graph.
+
+        An existing interaction of a pair is updated, in whichever direction it was stored.
+
+        Parameters
+        ----------
+        pairs : list[tuple[Element, Element]]
+            The pairs of elements or ElementNodes.
+        geometries : list, optional
+            One geometry per pair, stored as the ``geometry`` attribute of the edge.
+            A dictionary is stored as the edge attributes instead, e.g. ``{"geometry": [...], "faces": [...]}``.
+
+        Returns
+        -------
+        list[tuple[hashable, hashable]]
+            The identifiers of the edges.
+        """
+        graph = self._interactions
+        self._adjacency = None
+        geometries = geometries if geometries is not None else [None] * len(pairs)
+        edges = []
+        for (element0, element1), geometry in zip(pairs, geometries):
+            element0 = element0.element if isinstance(element0, ElementNode) else element0
+            element1 = element1.element if isinstance(element1, ElementNode) else element1
+            u, v = str(element0.guid), str(element1.guid)
+            if u not in graph.node or v not in graph.node:
+                raise ValueError("The node does not exist.")
+
+            attribute_dict = dict(geometry) if isinstance(geometry, dict) else {"geometry": geometry}
+            attribute_dict["weight"] = distance_point_point(element0.aabb_center(), element1.aabb_center())
+
+            # update the edge in the direction it is stored
+            if u in graph.edge[v] and v not in graph.edge[u]:
+                u, v = v, u
+            graph.edge[u].setdefault(v, {}).update(attribute_dict)
+            graph.adjacency[u][v] = None
+            graph.adjacency[v][u] = None
+            edges.append((u, v))
+        return edges
+
+    def _get_interaction_data(self, u, v):
+        """Get the attributes of the edge between two graph nodes in either direction, or None."""
+        edge = self._interactions.edge
+        if u in edge and v in edge[u]:
+            return edge[u][v]
+        if v in edge and u in edge[v]:
+            return edge[v][u]
+        return None
+
+    def _delete_interaction_edge(self, u, v):
+        """Delete the edge between two graph nodes in both directions, if it exists."""
+        graph = self._interactions
+        if u not in graph.node or v not in graph.node:
+            return
+        self._adjacency = None
+        graph.edge[u].pop(v, None)
+        graph.edge[v].pop(u, None)
+        graph.adjacency[u].pop(v, None)
+        graph.adjacency[v].pop(u, None)
+
     def get_interactions(self):
         """
         Get all interactions between elements.
@@ -1712,6 +2406,17 @@ class Model(Data):
         """
         return list(self._interactions.edges())
 
+    def get_joint_table(self):
+        """
+        Get the joints of all interactions in one columnar snapshot.
+
+        Returns
+        -------
+        :class:`compas_assembly2.JointTable`
+            The polygon vertices, frames, normals, and surface areas of the joints, with their edges.
+        """
+        return JointTable.from_model(self)
+
     def get_interactions_geometry(self):
         """get geometric features within the interactions, if they exist"""
         return self._interactions.edges_attribute("geometry")
@@ -1834,6 +2539,9 @@ class Model(Data):
     def set_element_by_guid(self, guid, element):
         self.composition.set_element_by_guid(guid, element)
 
+    def set_elements_by_guid(self, guids, elements):
+        self.composition.set_elements_by_guid(guids, elements)
+
     def set_element_by_element(self, existing_element, element):
         self.composition.set_element_by_element(existing_element, element)
 
@@ -1856,7 +2564,7 @@ class Model(Data):
         int
             The total number of elements in the model.
         """
-        return len(list(self.elements))
+        return len(self._elements)
 
     @property
     def number_of_nodes(self):
@@ -1868,17 +2576,7 @@ class Model(Data):
         int
             The total number of child nodes in the tree hierarchy.
         """
-
-        def _count(node):
-            count = 0
-            if node.children is None:
-                return 0
-            for child in node.children:
-                count += 1 + _count(child)
-            return count
-
-        total_children = _count(self._hierarchy.root)
-        return total_children
+        return self._hierarchy.root._number_of_nodes
 
     @property
     def number_of_edges(self):
@@ -2030,6 +2728,22 @@ class Model(Data):
         """transform the model"""
         for e in self._elements.values():
             e.transform(transformation)
+        self._store = None
+
+        # keep the topology of the spatial index and only refit the boxes
+        if self._bvh is not None:
+            Algorithms.inflate_bounding_boxes(list(self._elements.values()), oobb=False)
+            self._bvh.refit({key: e.aabb() for key, e in self._elements.items()})
+            self._bvh_dirty.clear()
+
+    def compute_bounding_boxes(self, inflate=0.00):
+        """rebuild the axis-aligned and oriented bounding-boxes of all elements in one batch"""
+        Algorithms.compute_bounding_boxes(list(self._elements.values()), inflate, recompute=True)
+        self._store = None
+
+        # the spatial index follows the new boxes
+        if self._bvh is not None:
+            self._bvh.refit({key: e.aabb() for key, e in self._elements.items()})
 
     def transformed(self, transformation):
         """transform the copy of the model"""
@@ -2050,19 +2764,51 @@ class Model(Data):
         max_neighbors=8,
         attributes=[],
         skip_the_same=True,
+        broad_phase=None,
+        workers=1,
+        incremental=False,
     ):
         # ==========================================================================
         # ELEMENTS FROM JSON
         # ==========================================================================
         elements_list = list(self._elements.values())
 
+        # ==========================================================================
+        # INCREMENTAL MODE - only the elements added, replaced, or transformed since
+        # the last detection are queried in the BVH, their old edges are deleted
+        # and the pairs with their neighbours are detected again
+        # ==========================================================================
+        if incremental:
+            versions = self._interaction_versions
+            dirty = [i for i, e in enumerate(elements_list) if versions.get(str(e.guid)) != e.version]
+            dirty_elements = [elements_list[i] for i in dirty]
+
+            # the boxes of the dirty elements are moved when the spatial index is queried, see Model.bvh
+            for e in dirty_elements:
+                self._delete_interaction_edges(str(e.guid))
+
+            broad_phase = "dirty"
+
         # ==========================================================================
         # FIND NEAREST OBJECTS BY
         # 1) SIMPLE 2X FOR LOOP
-        # 2) KD-TREE
+        # 2) KD-TREE - max_neighbors=None searches by radius without the neighbour cap
+        # 3) BVH - broad_phase="bvh", the hierarchy is kept by the model between calls
+        # 4) SPATIAL HASH - broad_phase="grid", for elements of similar size
         # ==========================================================================
         collision_pairs = []
-        if simple_or_tree_search:
+        if broad_phase == "dirty":
+            collision_pairs = Algorithms.get_collision_pairs_bvh_of(
+                elements_list, self.bvh, dirty, aaab_inflation, attributes, skip_the_same
+            )
+        elif broad_phase == "bvh":
+            collision_pairs = Algorithms.get_collision_pairs_bvh(
+                elements_list, self.bvh, aaab_inflation, attributes, skip_the_same
+            )
+        elif broad_phase == "grid":
+            Algorithms.inflate_bounding_boxes(elements_list, aaab_inflation)
+            collision_pairs = Algorithms.get_collision_pairs_grid(elements_list, None, True, attributes, skip_the_same)
+        elif simple_or_tree_search:
             collision_pairs = Algorithms.get_collision_pairs_with_attributes(
                 elements_list, attributes, aaab_inflation, skip_the_same
             )
@@ -2071,6 +2817,25 @@ class Model(Data):
                 elements_list, max_neighbors, True, attributes, skip_the_same
             )
 
+        # ==========================================================================
+        # FULL MODE - the elements transformed since the last detection lose the edges
+        # of the pairs that do not collide anymore, the other edges are written again below
+        # ==========================================================================
+        if not incremental:
+            versions = self._interaction_versions
+            moved = [key for key, e in self._elements.items() if key in versions and versions[key] != e.version]
+            if moved:
+                keys = [str(e.guid) for e in elements_list]
+                recomputed = set()
+                for i, j in collision_pairs:
+                    recomputed.add((keys[i], keys[j]))
+                    recomputed.add((keys[j], keys[i]))
+                adjacency = self._interactions.adjacency
+                for key in moved:
+                    for neighbour in list(adjacency.get(key, ())):
+                        if neighbour != key and (key, neighbour) not in recomputed:
+                            self._delete_interaction_edge(key, neighbour)
+
         # ==========================================================================
         # INTERFACE DETECTION
         # 0 - face_to_face
@@ -2081,36 +2846,85 @@ class Model(Data):
         output = []
         geometry_feature_detected = False
         if detection_type == 0:
+            # the pairs of unchanged elements whose edge was written by a detection with the same settings
+            # reuse the stored interfaces, the other pairs are detected again
+            settings = [detection_type, tmax, amin]
+            versions = self._interaction_versions if settings == self._interaction_settings else {}
+            cached = {}
+            todo = []
+            for idx, (i, j) in enumerate(collision_pairs):
+                e0, e1 = elements_list[i], elements_list[j]
+                data = None
+                if versions.get(str(e0.guid)) == e0.version and versions.get(str(e1.guid)) == e1.version:
+                    data = self._get_interaction_data(str(e0.guid), str(e1.guid))
+                if data is not None and "faces" in data:
+                    cached[idx] = list(zip(data["faces"], data["geometry"]))
+                else:
+                    todo.append(idx)
+
+            # workers > 1 runs the pairs in separate processes, the order of the results is kept
+            results = Algorithms.face_to_face_pairs(
+                elements_list, [collision_pairs[idx] for idx in todo], tmax, amin, workers
+            )
+            results = dict(zip(todo, results))
             for idx, collision_pair in enumerate(collision_pairs):
-                result = Algorithms.face_to_face(
-                    elements_list[collision_pair[0]], elements_list[collision_pair[1]], tmax, amin
-                )
-                # print("face_to_face", collision_pair)
                 # output: type, collission pair, face pair, intersection polygon
-                for r in result:
-                    if result:
-                        output.append([collision_pair, r[0], r[1]])
+                for r in cached[idx] if idx in cached else results[idx]:
+                    output.append([collision_pair, r[0], r[1]])
             geometry_feature_detected = True
+            self._interaction_settings = settings
 
         # ==========================================================================
-        # ADD GRAPH EDGES
+        # ADD GRAPH EDGES - one edge per pair with all its interfaces, in one bulk write
         # ==========================================================================
         if geometry_feature_detected:
-            for o in output:
-                id0 = o[0][0]
-                id1 = o[0][1]
-                geometric_features = o[2]
-                self.add_interaction(elements_list[id0], elements_list[id1], geometric_features)
+            pairs, geometries = [], []
+            for idx in todo:
+                i, j = collision_pairs[idx]
+                if results[idx]:
+                    pairs.append((elements_list[i], elements_list[j]))
+                    face_frames = elements_list[i].face_frames
+                    geometries.append(
+                        {
+                            "geometry": [r[1] for r in results[idx]],
+                            "faces": [r[0] for r in results[idx]],
+                            "joints": [Joint.from_face_to_face(r[1], face_frames[r[0][0]]) for r in results[idx]],
+                        }
+                    )
+                else:
+                    # the pair has no interface anymore
+                    self._delete_interaction_edge(str(elements_list[i].guid), str(elements_list[j].guid))
+            self.add_interactions(pairs, geometries)
         else:
-            for idx, collision_pair in enumerate(collision_pairs):
-                self.add_interaction(elements_list[collision_pair[0]], elements_list[collision_pair[1]])
-                # self.add_interaction(elements_list[collision_pair[1]], elements_list[collision_pair[0]])
+            pairs = [(elements_list[i], elements_list[j]) for i, j in collision_pairs]
+            self.add_interactions(pairs)
+
+        # the next incremental detection starts from these versions
+        self._interaction_versions = {str(e.guid): e.version for e in elements_list}
 
         # ==========================================================================
         # OUTPUT
         # ==========================================================================
         return output
 
+    def find_shortest_paths(self, sources, targets):
+        """
+        Find the shortest paths from many elements to many elements in the interaction graph.
+
+        Parameters
+        ----------
+        sources : list[Element]
+            The start elements or ElementNodes.
+        targets : list[Element]
+            The end elements or ElementNodes.
+
+        Returns
+        -------
+        list[list[list[Element] | None]]
+            For each source and each target, the elements of the path, None if they are not connected.
+        """
+        return Algorithms.shortest_paths(self, sources, targets)
+
     def find_shortest_path(self, element0, element1, output_display_geometry=False):
         elements = Algorithms.shortest_path(self, element0, element1)
 
@@ -0,0 +1,774 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from math import floor
+
+# ==========================================================================
+# BOX UTILITIES
+# boxes are stored as [xmin, ymin, zmin, xmax, ymax, zmax] lists
+# ==========================================================================
+
+
+def _to_bounds(box):
+    """Convert eight corners of an axis-aligned box or a six-number list to [xmin, ymin, zmin, xmax, ymax, zmax]."""
+    if len(box) == 8:
+        return [box[0][0], box[0][1], box[0][2], box[6][0], box[6][1], box[6][2]]
+    return [box[0], box[1], box[2], box[3], box[4], box[5]]
+
+
+def _union(a, b):
+    return [
+        a[0] if a[0] < b[0] else b[0],
+        a[1] if a[1] < b[1] else b[1],
+        a[2] if a[2] < b[2] else b[2],
+        a[3] if a[3] > b[3] else b[3],
+        a[4] if a[4] > b[4] else b[4],
+        a[5] if a[5] > b[5] else b[5],
+    ]
+
+
+def _half_area(box):
+    dx = box[3] - box[0]
+    dy = box[4] - box[1]
+    dz = box[5] - box[2]
+    return dx * dy + dy * dz + dz * dx
+
+
+def _overlaps(a, b, tolerance=0.0):
+    return (
+        a[0] <= b[3] + tolerance
+        and b[0] <= a[3] + tolerance
+        and a[1] <= b[4] + tolerance
+        and b[1] <= a[4] + tolerance
+        and a[2] <= b[5] + tolerance
+        and b[2] <= a[5] + tolerance
+    )
+
+
+def _contains(a, b):
+    return a[0] <= b[0] and a[1] <= b[1] and a[2] <= b[2] and b[3] <= a[3] and b[4] <= a[4] and b[5] <= a[5]
+
+
+def _ray_entry(box, origin, inverse_direction, tmax):
+    """Slab test, returns the distance along the ray where it enters the box, or None."""
+    tmin = 0.0
+    for axis in range(3):
+        inverse = inverse_direction[axis]
+        if inverse is None:
+            # the ray is parallel to the slab
+            if origin[axis] < box[axis] or origin[axis] > box[axis + 3]:
+                return None
+            continue
+        t0 = (box[axis] - origin[axis]) * inverse
+        t1 = (box[axis + 3] - origin[axis]) * inverse
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > tmin:
+            tmin = t0
+        if t1 < tmax:
+            tmax = t1
+        if tmin > tmax:
+            return None
+    return tmin
+
+
+class _BVHNode(object):
+    """Internal node of the bounding-volume hierarchy, a leaf when key is not None."""
+
+    __slots__ = ["box", "key", "parent", "left", "right", "height"]
+
+    def __init__(self, box, key=None):
+        self.box = box
+        self.key = key
+        self.parent = None
+        self.left = None
+        self.right = None
+        self.height = 0
+
+    @property
+    def is_leaf(self):
+        return self.left is None
+
+
+class BVH(object):
+    """A dynamic bounding-volume hierarchy of axis-aligned bounding-boxes.
+
+    The tree is a self-balancing binary tree, where every leaf stores one box and a key, e.g. the element guid.
+    Leaves are inserted by following the cheapest surface-area path and the tree is re-balanced by rotations,
+    therefore adding, removing, and moving boxes does not require a full rebuild.
+
+    Parameters
+    ----------
+    margin : float, optional
+        The leaf boxes are enlarged by this margin, so small movements do not change the tree.
+
+    Examples
+    --------
+    >>> bvh = BVH()
+    >>> bvh.insert("a", [0, 0, 0, 1, 1, 1])
+    >>> bvh.insert("b", [1, 0, 0, 2, 1, 1])
+    >>> bvh.insert("c", [5, 5, 5, 6, 6, 6])
+    >>> bvh.query_pairs()
+    [('a', 'b')]
+    >>> bvh.query_box([0.5, 0.5, 0.5, 0.6, 0.6, 0.6])
+    ['a']
+    >>> bvh.query_ray([-1, 0.5, 0.5], [1, 0, 0])
+    ['a', 'b']
+
+    """
+
+    def __init__(self, margin=0.0):
+        self.margin = margin
+        self._root = None
+        self._leaves = {}  # key, leaf node
+        self._order = {}  # key, insertion order used to sort the query results
+        self._next_order = 0  # never reused, removed keys leave gaps in the order
+
+    # ==========================================================================
+    # properties
+    # ==========================================================================
+
+    def __len__(self):
+        return len(self._leaves)
+
+    def __contains__(self, key):
+        return key in self._leaves
+
+    def __repr__(self):
+        return "<BVH with {} boxes, height {}>".format(len(self._leaves), self.height)
+
+    @property
+    def height(self):
+        return self._root.height if self._root else 0
+
+    @property
+    def box(self):
+        """The box enclosing the whole hierarchy, [xmin, ymin, zmin, xmax, ymax, zmax]."""
+        return list(self._root.box) if self._root else None
+
+    def keys(self):
+        return sorted(self._leaves, key=self._order.__getitem__)
+
+    def leaf_box(self, key):
+        return list(self._leaves[key].box)
+
+    # ==========================================================================
+    # construction
+    # ==========================================================================
+
+    @classmethod
+    def from_boxes(cls, keys, boxes, margin=0.0):
+        """Build a balanced hierarchy at once by recursive median splits along the longest axis.
+
+        Parameters
+        ----------
+        keys : list[hashable]
+            The keys of the boxes.
+        boxes : list[list[float]]
+            Eight corners or [xmin, ymin, zmin, xmax, ymax, zmax] of each box, None values are skipped.
+        margin : float, optional
+            The leaf boxes are enlarged by this margin.
+
+        Returns
+        -------
+        :class:`BVH`
+
+        """
+        bvh = cls(margin=margin)
+        leaves = []
+        for key, box in zip(keys, boxes):
+            if box is None or len(box) == 0:
+                continue
+            leaf = _BVHNode(bvh._fatten(_to_bounds(box)), key)
+            bvh._order[key] = bvh._next_order
+            bvh._next_order += 1
+            bvh._leaves[key] = leaf
+            leaves.append(leaf)
+
+        if not leaves:
+            return bvh
+
+        # iterative top-down build, each stack item is a list of leaves and the node to fill
+        bvh._root = _BVHNode(None)
+        stack = [(leaves, bvh._root)]
+        internals = []
+        while stack:
+            items, node = stack.pop()
+            if len(items) == 1:
+                leaf = items[0]
+                node.box, node.key = leaf.box, leaf.key
+                bvh._leaves[leaf.key] = node
+                continue
+            box = items[0].box
+            for item in items[1:]:
+                box = _union(box, item.box)
+            axis = max(range(3), key=lambda a: box[a + 3] - box[a])
+            items = sorted(items, key=lambda item: item.box[axis] + item.box[axis + 3])
+            middle = len(items) // 2
+            node.left, node.right = _BVHNode(None), _BVHNode(None)
+            node.left.parent = node.right.parent = node
+            internals.append(node)
+            stack.append((items[:middle], node.left))
+            stack.append((items[middle:], node.right))
+
+        # children are always created after their parents, fix boxes and heights in reverse
+        for node in reversed(internals):
+            node.box = _union(node.left.box, node.right.box)
+            node.height = 1 + max(node.left.height, node.right.height)
+        return bvh
+
+    def _fatten(self, box):
+        if self.margin == 0.0:
+            return box
+        m = self.margin
+        return [box[0] - m, box[1] - m, box[2] - m, box[3] + m, box[4] + m, box[5] + m]
+
+    # ==========================================================================
+    # modifiers
+    # ==========================================================================
+
+    def insert(self, key, box):
+        """Insert a box, or move it if the key already exists.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the box, e.g. the element guid.
+        box : list
+            Eight corners or [xmin, ymin, zmin, xmax, ymax, zmax].
+
+        Returns
+        -------
+        None
+
+        """
+        if key in self._leaves:
+            self.update(key, box)
+            return
+        leaf = _BVHNode(self._fatten(_to_bounds(box)), key)
+        self._order[key] = self._next_order
+        self._next_order += 1
+        self._leaves[key] = leaf
+        self._insert_leaf(leaf)
+
+    def remove(self, key):
+        """Remove the box with the given key.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the box.
+
+        Returns
+        -------
+        None
+
+        """
+        leaf = self._leaves.pop(key)
+        del self._order[key]
+        self._remove_leaf(leaf)
+
+    def update(self, key, box):
+        """Move a box, the tree is changed only if the new box leaves the enlarged leaf box.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the box.
+        box : list
+            Eight corners or [xmin, ymin, zmin, xmax, ymax, zmax].
+
+        Returns
+        -------
+        bool
+            True if the leaf was re-inserted.
+
+        """
+        leaf = self._leaves[key]
+        bounds = _to_bounds(box)
+        if self.margin > 0.0 and _contains(leaf.box, bounds):
+            return False
+        self._remove_leaf(leaf)
+        leaf.box = self._fatten(bounds)
+        self._insert_leaf(leaf)
+        return True
+
+    def refit(self, boxes):
+        """Replace the leaf boxes and recompute the boxes of the internal nodes, keeping the topology.
+
+        Use it after transforming many boxes at once, e.g. the whole model.
+
+        Parameters
+        ----------
+        boxes : dict[hashable, list]
+            The new box of each key, keys that are not given keep their box.
+
+        Returns
+        -------
+        None
+
+        """
+        for key, box in boxes.items():
+            if key in self._leaves and box:
+                self._leaves[key].box = self._fatten(_to_bounds(box))
+
+        # post-order walk, children are refitted before parents
+        if self._root is None:
+            return
+        stack = [(self._root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if node.is_leaf:
+                continue
+            if visited:
+                node.box = _union(node.left.box, node.right.box)
+            else:
+                stack.append((node, True))
+                stack.append((node.left, False))
+                stack.append((node.right, False))
+
+    def clear(self):
+        self._root = None
+        self._leaves = {}
+        self._order = {}
+        self._next_order = 0
+
+    def _insert_leaf(self, leaf):
+        leaf.parent = None
+        if self._root is None:
+            self._root = leaf
+            return
+
+        # --------------------------------------------------------------------------
+        # find the best sibling by descending the cheapest surface-area path
+        # --------------------------------------------------------------------------
+        box = leaf.box
+        node = self._root
+        while not node.is_leaf:
+            area = _half_area(node.box)
+            combined_area = _half_area(_union(node.box, box))
+            cost = 2.0 * combined_area
+            inheritance_cost = 2.0 * (combined_area - area)
+
+            costs = []
+            for child in (node.left, node.right):
+                child_cost = _half_area(_union(box, child.box)) + inheritance_cost
+                if not child.is_leaf:
+                    child_cost -= _half_area(child.box)
+                costs.append(child_cost)
+
+            if cost < costs[0] and cost < costs[1]:
+                break
+            node = node.left if costs[0] < costs[1] else node.right
+
+        # --------------------------------------------------------------------------
+        # create a new parent for the sibling and the leaf
+        # --------------------------------------------------------------------------
+        sibling = node
+        old_parent = sibling.parent
+        new_parent = _BVHNode(_union(box, sibling.box))
+        new_parent.parent = old_parent
+        new_parent.height = sibling.height + 1
+        new_parent.left, new_parent.right = sibling, leaf
+        sibling.parent = leaf.parent = new_parent
+
+        if old_parent is None:
+            self._root = new_parent
+        elif old_parent.left is sibling:
+            old_parent.left = new_parent
+        else:
+            old_parent.right = new_parent
+
+        self._fix_upwards(leaf.parent)
+
+    def _remove_leaf(self, leaf):
+        if leaf is self._root:
+            self._root = None
+            return
+
+        parent = leaf.parent
+        grand_parent = parent.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+
+        if grand_parent is None:
+            self._root = sibling
+            sibling.parent = None
+        else:
+            if grand_parent.left is parent:
+                grand_parent.left = sibling
+            else:
+                grand_parent.right = sibling
+            sibling.parent = grand_parent
+            self._fix_upwards(grand_parent)
+        leaf.parent = None
+
+    def _fix_upwards(self, node):
+        while node is not None:
+            node = self._balance(node)
+            node.height = 1 + max(node.left.height, node.right.height)
+            node.box = _union(node.left.box, node.right.box)
+            node = node.parent
+
+    def _balance(self, a):
+        """Rotate the subtree if its children heights differ by more than one, returns the new subtree root."""
+        if a.is_leaf or a.height < 2:
+            return a
+
+        b, c = a.left, a.right
+        balance = c.height - b.height
+        if balance > 1:
+            self._rotate_up(a, c, b, is_right=True)
+            return c
+        if balance < -1:
+            self._rotate_up(a, b, c, is_right=False)
+            return b
+        return a
+
+    def _rotate_up(self, a, c, b, is_right):
+        """Lift the child c above a, b is the other child of a."""
+        f, g = c.left, c.right
+
+        # swap a and c
+        c.parent = a.parent
+        a.parent = c
+        if c.parent is None:
+            self._root = c
+        elif c.parent.left is a:
+            c.parent.left = c
+        else:
+            c.parent.right = c
+
+        # keep the taller grandchild f below c, attach the other one to a
+        if f.height > g.height:
+            taller, smaller = f, g
+        else:
+            taller, smaller = g, f
+
+        c.left, c.right = a, taller
+        if is_right:
+            a.right = smaller
+        else:
+            a.left = smaller
+        smaller.parent = a
+
+        a.box = _union(b.box, smaller.box)
+        c.box = _union(a.box, taller.box)
+        a.height = 1 + max(b.height, smaller.height)
+        c.height = 1 + max(a.height, taller.height)
+
+    # ==========================================================================
+    # queries
+    # ==========================================================================
+
+    def query_box(self, box, tolerance=0.0):
+        """Find the keys of the boxes overlapping the given box.
+
+        Parameters
+        ----------
+        box : list
+            Eight corners or [xmin, ymin, zmin, xmax, ymax, zmax].
+        tolerance : float, optional
+            Boxes closer than the tolerance are also considered overlapping.
+
+        Returns
+        -------
+        list[hashable]
+            The keys in insertion order.
+
+        """
+        result = []
+        if self._root is None:
+            return result
+        bounds = _to_bounds(box)
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if not _overlaps(node.box, bounds, tolerance):
+                continue
+            if node.is_leaf:
+                result.append(node.key)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+        result.sort(key=self._order.__getitem__)
+        return result
+
+    def query_ray(self, origin, direction, max_distance=None):
+        """Find the keys of the boxes hit by a ray.
+
+        Parameters
+        ----------
+        origin : list[float]
+            The start point of the ray.
+        direction : list[float]
+            The direction of the ray, the distances are measured in multiples of its length.
+        max_distance : float, optional
+            Boxes entered beyond this distance are ignored.
+
+        Returns
+        -------
+        list[hashable]
+            The keys sorted by the distance where the ray enters the box.
+
+        """
+        result = []
+        if self._root is None:
+            return result
+        inverse_direction = [None if abs(d) < 1e-12 else 1.0 / d for d in direction]
+        tmax = float("inf") if max_distance is None else max_distance
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            t = _ray_entry(node.box, origin, inverse_direction, tmax)
+            if t is None:
+                continue
+            if node.is_leaf:
+                result.append((t, self._order[node.key], node.key))
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+        result.sort()
+        return [key for _, _, key in result]
+
+    def query_pairs(self, tolerance=0.0):
+        """Find all pairs of overlapping boxes by colliding the hierarchy with itself.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            Boxes closer than the tolerance are also considered overlapping.
+
+        Returns
+        -------
+        list[tuple[hashable, hashable]]
+            The pairs of keys, the first key is inserted before the second one, sorted in insertion order.
+
+        """
+        order = self._order
+        pairs = []
+        if self._root is None or self._root.is_leaf:
+            return pairs
+
+        # a stack item is either a single node to collide with itself, or two nodes to collide with each other
+        stack = [(self._root, None)]
+        while stack:
+            a, b = stack.pop()
+            if b is None:
+                if not a.is_leaf:
+                    stack.append((a.left, None))
+                    stack.append((a.right, None))
+                    stack.append((a.left, a.right))
+                continue
+
+            if not _overlaps(a.box, b.box, tolerance):
+                continue
+
+            if a.is_leaf and b.is_leaf:
+                if order[a.key] < order[b.key]:
+                    pairs.append((a.key, b.key))
+                else:
+                    pairs.append((b.key, a.key))
+            elif b.is_leaf or (not a.is_leaf and a.height >= b.height):
+                stack.append((a.left, b))
+                stack.append((a.right, b))
+            else:
+                stack.append((a, b.left))
+                stack.append((a, b.right))
+
+        pairs.sort(key=lambda pair: (order[pair[0]], order[pair[1]]))
+        return pairs
+
+
+class SpatialHash(object):
+    """A uniform grid of cubic cells hashing axis-aligned bounding-boxes.
+
+    Every box is registered in all cells it overlaps, so the grid works best for boxes of similar size,
+    e.g. masonry blocks or plates, when the cell size is close to the typical box size.
+    Insertion and queries only visit the cells of one box, which makes indexing linear in the number of boxes.
+
+    Parameters
+    ----------
+    cell_size : float
+        The edge length of the cubic cells.
+
+    Examples
+    --------
+    >>> grid = SpatialHash(cell_size=1.0)
+    >>> grid.insert_and_query("a", [0, 0, 0, 1, 1, 1])
+    []
+    >>> grid.insert_and_query("b", [1, 0, 0, 2, 1, 1])
+    ['a']
+    >>> grid.insert_and_query("c", [5, 5, 5, 6, 6, 6])
+    []
+    >>> grid.query_pairs()
+    [('a', 'b')]
+
+    """
+
+    def __init__(self, cell_size):
+        if not cell_size > 0.0:
+            raise ValueError("The cell size must be positive.")
+        self.cell_size = float(cell_size)
+        self._cells = {}  # (i, j, k), list of keys
+        self._boxes = {}  # key, [xmin, ymin, zmin, xmax, ymax, zmax]
+        self._order = {}  # key, insertion order used to sort the query results
+        self._next_order = 0  # never reused, removed keys leave gaps in the order
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, key):
+        return key in self._boxes
+
+    def __repr__(self):
+        return "<SpatialHash with {} boxes, {} cells>".format(len(self._boxes), len(self._cells))
+
+    def _cell_range(self, box, tolerance=0.0):
+        size = self.cell_size
+        return [
+            range(int(floor((box[axis] - tolerance) / size)), int(floor((box[axis + 3] + tolerance) / size)) + 1)
+            for axis in range(3)
+        ]
+
+    def _cells_of(self, box, tolerance=0.0):
+        x_range, y_range, z_range = self._cell_range(box, tolerance)
+        for i in x_range:
+            for j in y_range:
+                for k in z_range:
+                    yield (i, j, k)
+
+    # ==========================================================================
+    # modifiers
+    # ==========================================================================
+
+    def insert(self, key, box):
+        """Insert a box, or move it if the key already exists.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the box, e.g. the element guid.
+        box : list
+            Eight corners or [xmin, ymin, zmin, xmax, ymax, zmax].
+
+        Returns
+        -------
+        None
+
+        """
+        if key in self._boxes:
+            self.remove(key)
+        bounds = _to_bounds(box)
+        self._boxes[key] = bounds
+        self._order[key] = self._next_order
+        self._next_order += 1
+        cells = self._cells
+        for cell in self._cells_of(bounds):
+            if cell in cells:
+                cells[cell].append(key)
+            else:
+                cells[cell] = [key]
+
+    def remove(self, key):
+        """Remove the box with the given key.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the box.
+
+        Returns
+        -------
+        None
+
+        """
+        bounds = self._boxes.pop(key)
+        del self._order[key]
+        for cell in self._cells_of(bounds):
+            keys = self._cells[cell]
+            keys.remove(key)
+            if not keys:
+                del self._cells[cell]
+
+    def clear(self):
+        self._cells = {}
+        self._boxes = {}
+        self._order = {}
+        self._next_order = 0
+
+    # ==========================================================================
+    # queries
+    # ==========================================================================
+
+    def query_box(self, box, tolerance=0.0):
+        """Find the keys of the boxes overlapping the given box.
+
+        Parameters
+        ----------
+        box : list
+            Eight corners or [xmin, ymin, zmin, xmax, ymax, zmax].
+        tolerance : float, optional
+            Boxes closer than the tolerance are also considered overlapping.
+
+        Returns
+        -------
+        list[hashable]
+            The keys in insertion order.
+
+        """
+        bounds = _to_bounds(box)
+        boxes = self._boxes
+        result = set()
+        for cell in self._cells_of(bounds, tolerance):
+            for key in self._cells.get(cell, ()):
+                if key not in result and _overlaps(boxes[key], bounds, tolerance):
+                    result.add(key)
+        return sorted(result, key=self._order.__getitem__)
+
+    def insert_and_query(self, key, box, tolerance=0.0):
+        """Stream a box into the grid and return the keys of the already inserted boxes it overlaps.
+
+        Inserting all boxes one by one with this method outputs every overlapping pair exactly once.
+
+        Parameters
+        ----------
+        key : hashable
+            The identifier of the box.
+        box : list
+            Eight corners or [xmin, ymin, zmin, xmax, ymax, zmax].
+        tolerance : float, optional
+            Boxes closer than the tolerance are also considered overlapping.
+
+        Returns
+        -------
+        list[hashable]
+            The keys in insertion order.
+
+        """
+        neighbours = self.query_box(box, tolerance)
+        self.insert(key, box)
+        return neighbours
+
+    def query_pairs(self, tolerance=0.0):
+        """Find all pairs of overlapping boxes.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            Boxes closer than the tolerance are also considered overlapping.
+
+        Returns
+        -------
+        list[tuple[hashable, hashable]]
+            The pairs of keys, the first key is inserted before the second one, sorted in insertion order.
+
+        """
+        order = self._order
+        pairs = []
+        for key in sorted(self._boxes, key=order.__getitem__):
+            for other in self.query_box(self._boxes[key], tolerance):
+                if order[other] < order[key]:
+                    pairs.append((other, key))
+        pairs.sort(key=lambda pair: (order[pair[0]], order[pair[1]]))
+        return pairs
@@ -0,0 +1,301 @@
+from __future__ import print_function
+from __future__ import absolute_import
+from __future__ import division
+
+from compas.geometry import Frame, Vector
+from compas.datastructures import Mesh
+
+# ==========================================================================
+# COLUMNAR STORAGE OF ELEMENTS
+# one row per element, the variable-length mesh buffers are indexed by offsets
+# ==========================================================================
+
+
+class ElementStore(object):
+    """A struct-of-arrays snapshot of elements: frames, bounding-boxes, insertion vectors, and mesh buffers.
+
+    Every property of the elements is stored in one contiguous NumPy array with one row per element,
+    so vectorized algorithms can walk the whole model without touching the element objects.
+    The vertices and faces of the first mesh of every element are flattened into shared buffers,
+    where the element ``i`` owns the vertices ``vertex_offsets[i]:vertex_offsets[i + 1]``
+    and the faces ``element_face_offsets[i]:element_face_offsets[i + 1]``.
+    The face vertex indices are local to the element.
+
+    The store is an opt-in snapshot next to the elements, it does not replace them:
+    the elements keep their own frames, boxes and meshes, so a model with a store uses more memory, not less.
+    The rows of the elements transformed since the snapshot, found by :attr:`Element.version`,
+    are recomputed by :meth:`refresh`.
+
+    Parameters
+    ----------
+    elements : list[:class:`compas_assembly2.Element`], optional
+        The elements, the order of the rows.
+
+    Attributes
+    ----------
+    keys : list[str]
+        The element GUID strings.
+    frames : numpy.ndarray
+        An (n, 4, 3) float array of the frame origins, x-axes, y-axes, and z-axes.
+    aabbs : numpy.ndarray
+        An (n, 6) float array of ``[xmin, ymin, zmin, xmax, ymax, zmax]`` rows, NaN for elements without a box.
+    oobbs : numpy.ndarray
+        An (n, 8, 3) float array of the oriented box corners, NaN for elements without a box.
+    insertions : numpy.ndarray
+        An (n, 3) float array of the insertion vectors.
+    vertices : numpy.ndarray
+        A (v, 3) float array of the mesh vertices of all elements.
+    vertex_offsets : numpy.ndarray
+        An (n + 1,) integer array of the first vertex of each element.
+    faces : numpy.ndarray
+        A (k,) integer array of the face vertex indices of all faces.
+    face_offsets : numpy.ndarray
+        An (f + 1,) integer array of the first face vertex index of each face.
+    element_face_offsets : numpy.ndarray
+        An (n + 1,) integer array of the first face of each element.
+    versions : numpy.ndarray
+        An (n,) integer array of the element versions the rows were computed from.
+
+    Examples
+    --------
+    >>> from compas_assembly2 import Element
+    >>> store = ElementStore([Element.from_frame(1, 1, 1), Element.from_frame(2, 1, 1)])
+    >>> len(store), store.vertices.shape, store.number_of_faces(1)
+    (2, (16, 3), 6)
+    >>> store[1].aabb.tolist()
+    [-1.0, -0.5, -0.5, 1.0, 0.5, 0.5]
+    >>> from compas.geometry import Translation
+    >>> store.element(1).transform(Translation.from_vector([0, 0, 1]))
+    >>> store.refresh(), store[1].aabb.tolist()
+    ([1], [-1.0, -0.5, 0.5, 1.0, 0.5, 1.5])
+
+    """
+
+    def __init__(self, elements=None):
+        from numpy import zeros
+
+        self._elements = []
+        self._index = {}
+        self.keys = []
+        self.frames = zeros((0, 4, 3))
+        self.aabbs = zeros((0, 6))
+        self.oobbs = zeros((0, 8, 3))
+        self.insertions = zeros((0, 3))
+        self.vertices = zeros((0, 3))
+        self.vertex_offsets = zeros(1, dtype=int)
+        self.faces = zeros(0, dtype=int)
+        self.face_offsets = zeros(1, dtype=int)
+        self.element_face_offsets = zeros(1, dtype=int)
+        self.versions = zeros(0, dtype=int)
+
+        if elements:
+            self._build(list(elements))
+
+    def _build(self, elements):
+        from numpy import asarray, concatenate, cumsum
+        from compas_assembly2.algorithms import Algorithms
+
+        # --------------------------------------------------------------------------
+        # one row per element
+        # --------------------------------------------------------------------------
+        self._elements = elements
+        self.keys = [str(e.guid) for e in elements]
+        self._index = {key: i for i, key in enumerate(self.keys)}
+        self.frames = asarray(
+            [[e.frame.point, e.frame.xaxis, e.frame.yaxis, e.frame.zaxis] for e in elements], dtype=float
+        ).reshape(-1, 4, 3)
+        self.aabbs = Algorithms.get_aabb_array(elements)
+        self.oobbs = Algorithms.get_oobb_array(elements)
+        self.insertions = asarray([list(e.insertion) for e in elements], dtype=float).reshape(-1, 3)
+        self.versions = asarray([e.version for e in elements], dtype=int)
+
+        # --------------------------------------------------------------------------
+        # flattened mesh buffers
+        # --------------------------------------------------------------------------
+        vertices, faces = [], []
+        vertex_counts, face_sizes, face_counts = [], [], []
+        for e in elements:
+            mesh_vertices, mesh_faces = [], []
+            if e.geometry and isinstance(e.geometry[0], Mesh):
+                mesh_vertices, mesh_faces = e.geometry[0].to_vertices_and_faces()
+            vertices.extend(mesh_vertices)
+            vertex_counts.append(len(mesh_vertices))
+            face_counts.append(len(mesh_faces))
+            for face in mesh_faces:
+                faces.extend(face)
+                face_sizes.append(len(face))
+
+        self.vertices = asarray(vertices, dtype=float).reshape(-1, 3)
+        self.vertex_offsets = concatenate([[0], cumsum(vertex_counts, dtype=int)])
+        self.faces = asarray(faces, dtype=int)
+        self.face_offsets = concatenate([[0], cumsum(face_sizes, dtype=int)])
+        self.element_face_offsets = concatenate([[0], cumsum(face_counts, dtype=int)])
+
+    def refresh(self, rows=None):
+        """Recompute the rows of the elements whose version changed since their row was computed.
+
+        The frames, boxes, insertion vectors and mesh vertices of the rows are overwritten in place.
+        The whole store is rebuilt if the number of mesh vertices or faces of an element changed.
+
+        Parameters
+        ----------
+        rows : list[int], optional
+            The rows to check, e.g. those of the elements known to be transformed.
+            All rows are compared with the element versions if None.
+
+        Returns
+        -------
+        list[int]
+            The refreshed rows.
+        """
+        from numpy import asarray
+        from compas_assembly2.algorithms import Algorithms
+
+        elements = self._elements
+        if rows is None:
+            rows = range(len(elements))
+        rows = sorted(i for i in set(rows) if elements[i].version != self.versions[i])
+        if not rows:
+            return rows
+
+        # --------------------------------------------------------------------------
+        # the mesh buffers are rewritten in place when the counts stay the same
+        # --------------------------------------------------------------------------
+        meshes = []
+        for i in rows:
+            e = elements[i]
+            mesh_vertices = []
+            if e.geometry and isinstance(e.geometry[0], Mesh):
+                mesh_vertices = e.geometry[0].vertices_attributes("xyz")
+                if e.geometry[0].number_of_faces() != self.number_of_faces(i):
+                    self._build(elements)
+                    return list(range(len(elements)))
+            if len(mesh_vertices) != self.vertex_offsets[i + 1] - self.vertex_offsets[i]:
+                self._build(elements)
+                return list(range(len(elements)))
+            meshes.append(mesh_vertices)
+
+        # --------------------------------------------------------------------------
+        # one row per refreshed element
+        # --------------------------------------------------------------------------
+        refreshed = [elements[i] for i in rows]
+        self.frames[rows] = asarray(
+            [[e.frame.point, e.frame.xaxis, e.frame.yaxis, e.frame.zaxis] for e in refreshed], dtype=float
+        ).reshape(-1, 4, 3)
+        self.aabbs[rows] = Algorithms.get_aabb_array(refreshed)
+        self.oobbs[rows] = Algorithms.get_oobb_array(refreshed)
+        self.insertions[rows] = asarray([list(e.insertion) for e in refreshed], dtype=float).reshape(-1, 3)
+        for i, mesh_vertices in zip(rows, meshes):
+            if mesh_vertices:
+                self.vertices[self.vertex_offsets[i] : self.vertex_offsets[i + 1]] = mesh_vertices  # noqa: E203
+        self.versions[rows] = [e.version for e in refreshed]
+        return rows
+
+    # ==========================================================================
+    # properties
+    # ==========================================================================
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return str(key) in self._index
+
+    def __iter__(self):
+        for i in range(len(self.keys)):
+            yield ElementView(self, i)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.keys)
+        if index < 0 or index >= len(self.keys):
+            raise IndexError("element index out of range")
+        return ElementView(self, index)
+
+    def __repr__(self):
+        return "<ElementStore with {} elements, {} vertices, {} faces>".format(
+            len(self.keys), len(self.vertices), len(self.face_offsets) - 1
+        )
+
+    @property
+    def centers(self):
+        """(n, 3) float array of the centers of the axis-aligned bounding-boxes."""
+        return (self.aabbs[:, :3] + self.aabbs[:, 3:]) * 0.5
+
+    # ==========================================================================
+    # access
+    # ==========================================================================
+
+    def index(self, key):
+        """Get the row of an element by its GUID or GUID string."""
+        return self._index[str(key)]
+
+    def element(self, index):
+        """Get the element stored at a row."""
+        return self._elements[index]
+
+    def number_of_faces(self, index):
+        """Get the number of mesh faces of the element at a row."""
+        return int(self.element_face_offsets[index + 1] - self.element_face_offsets[index])
+
+    def vertices_of(self, index):
+        """Get the (v, 3) array view of the mesh vertices of the element at a row."""
+        start, stop = self.vertex_offsets[index], self.vertex_offsets[index + 1]
+        return self.vertices[start:stop]
+
+    def faces_of(self, index):
+        """Get the mesh faces of the element at a row as lists of local vertex indices."""
+        start, stop = self.element_face_offsets[index], self.element_face_offsets[index + 1]
+        offsets = (self.face_offsets[start : stop + 1] - self.face_offsets[start]).tolist()  # noqa: E203
+        faces = self.faces[self.face_offsets[start] : self.face_offsets[stop]].tolist()  # noqa: E203
+        return [faces[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]  # noqa: E203
+
+
+class ElementView(object):
+    """A lightweight view of one row of an :class:`ElementStore`, the values are read from the arrays."""
+
+    __slots__ = ["store", "index"]
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    def __repr__(self):
+        return "<ElementView {} of {}>".format(self.index, self.key)
+
+    @property
+    def key(self):
+        return self.store.keys[self.index]
+
+    @property
+    def element(self):
+        return self.store.element(self.index)
+
+    @property
+    def frame(self):
+        point, xaxis, yaxis, _ = self.store.frames[self.index].tolist()
+        return Frame(point, xaxis, yaxis)
+
+    @property
+    def aabb(self):
+        return self.store.aabbs[self.index]
+
+    @property
+    def oobb(self):
+        return self.store.oobbs[self.index]
+
+    @property
+    def insertion(self):
+        return Vector(*self.store.insertions[self.index].tolist())
+
+    @property
+    def vertices(self):
+        return self.store.vertices_of(self.index)
+
+    @property
+    def faces(self):
+        return self.store.faces_of(self.index)
+
+    def to_mesh(self):
+        """Rebuild the mesh of the element from the buffers."""
+        return Mesh.from_vertices_and_faces(self.vertices.tolist(), self.faces)
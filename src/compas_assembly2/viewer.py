@@ -444,9 +444,9 @@ class Viewer:
                     # --------------------------------------------------------------------------
                     # add aabb | oobb | convex hull
                     # --------------------------------------------------------------------------
-                    if element._aabb:
+                    if element.aabb():
                         aabb_mesh = Mesh.from_vertices_and_faces(
-                            element._aabb,
+                            element.aabb(),
                             [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]],
                         )
 
@@ -466,9 +466,9 @@ class Viewer:
                         )
                         viewer_objects["viewer_aabbs"].append(o)
 
-                        if element._oobb:
+                        if element.oobb():
                             oobb_mesh = Mesh.from_vertices_and_faces(
-                                element._oobb,
+                                element.oobb(),
                                 [[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4], [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]],
                             )
                             o = viewer.add(
@@ -7,6 +7,20 @@ from compas_invocations import docs
 from compas_invocations import style
 from compas_invocations import tests
 from invoke import Collection
+from invoke import task
+
+
+@task(
+    help={
+        "runs": "Number of fresh interpreters that import the package.",
+        "limit": "Maximum median import time in milliseconds.",
+    }
+)
+def benchmark_import(ctx, runs=10, limit=3000):
+    """Check that the viewers, element types and optional dependencies are imported lazily, within a time limit."""
+    script = os.path.join(ctx.base_folder, "scripts", "benchmark_import_time.py")
+    ctx.run("python {} --runs {} --limit {}".format(script, runs, limit))
+
 
 ns = Collection(
     docs.help,
@@ -21,6 +35,7 @@ ns = Collection(
     build.prepare_changelog,
     build.clean,
     build.release,
+    benchmark_import,
 )
 ns.configure(
     {
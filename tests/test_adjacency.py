@@ -0,0 +1,69 @@
+import pytest
+from compas.geometry import Frame
+
+from compas_assembly2 import Element
+from compas_assembly2 import Model
+
+
+@pytest.fixture
+def chain():
+    """A model of four elements on the corners of a square, connected in a chain 0 - 1 - 2 - 3 through the model."""
+    model = Model()
+    corners = [[0, 0, 0], [0, 5, 0], [5, 5, 0], [5, 0, 0]]
+    elements = [Element.from_frame(1, 1, 1, Frame(corner, [1, 0, 0], [0, 1, 0])) for corner in corners]
+    for element in elements:
+        model.add_element(element=element)
+    for a, b in zip(elements, elements[1:]):
+        model.add_interaction(a, b)
+    return model, elements
+
+
+def keys(path):
+    return [str(element.guid) for element in path]
+
+
+def test_rebuilt_after_model_edits(chain):
+    model, elements = chain
+    adjacency = model.interaction_adjacency
+    assert model.interaction_adjacency is adjacency
+    assert keys(model.find_shortest_path(elements[0], elements[3])) == keys(elements)
+
+    model.add_interaction(elements[0], elements[3])
+    assert model.interaction_adjacency is not adjacency
+    assert keys(model.find_shortest_path(elements[0], elements[3])) == keys([elements[0], elements[3]])
+
+    model.remove_element(elements[3])
+    assert str(elements[3].guid) not in model.interaction_adjacency
+
+
+def test_invalidate_after_direct_edits(chain):
+    model, elements = chain
+    assert len(model.find_shortest_path(elements[0], elements[3])) == 4
+
+    # the same number of edges, only an explicit invalidation can tell
+    k = [str(element.guid) for element in elements]
+    model.interactions.delete_edge((k[1], k[2]))
+    model.interactions.add_edge(k[0], k[3])
+    model.invalidate_adjacency()
+    assert keys(model.find_shortest_path(elements[0], elements[3])) == [k[0], k[3]]
+    assert model.find_shortest_path(elements[1], elements[2]) == [elements[1], elements[0], elements[3], elements[2]]
+
+
+def test_rebuilt_after_direct_edge_count_change(chain):
+    model, elements = chain
+    assert len(model.interaction_adjacency) == 4
+    k = [str(element.guid) for element in elements]
+    model.interactions.delete_edge((k[1], k[2]))
+    assert model.find_shortest_path(elements[0], elements[3]) is None
+
+
+def test_invalidate_after_weight_change(chain):
+    model, elements = chain
+    model.add_interaction(elements[0], elements[3])
+    assert len(model.find_shortest_path(elements[0], elements[3])) == 2
+
+    u, v = str(elements[0].guid), str(elements[3].guid)
+    edge = model.interactions.edge[u][v] if v in model.interactions.edge[u] else model.interactions.edge[v][u]
+    edge["weight"] = 100.0
+    model.invalidate_adjacency()
+    assert len(model.find_shortest_path(elements[0], elements[3])) == 4
@@ -0,0 +1,90 @@
+import pytest
+from compas.colors import Color
+from compas.geometry import Frame
+
+from compas_assembly2 import Element
+from compas_assembly2 import Model
+
+
+def element_grid(nx, ny, nz):
+    elements = []
+    for i in range(nx):
+        for j in range(ny):
+            for k in range(nz):
+                elements.append(Element.from_frame(1, 1, 1, Frame([i, j, k], [1, 0, 0], [0, 1, 0])))
+    return elements
+
+
+@pytest.fixture
+def model():
+    model = Model("binary")
+    blocks = model.add_group("blocks")
+    sub = blocks.add_group("sub", attributes={"level": 1})
+    for i, element in enumerate(element_grid(3, 3, 2)):
+        (blocks if i % 2 else sub).add_element(element=element)
+    single = Element.from_frame(1, 1, 1, Frame([10, 0, 0], [1, 0, 0], [0, 1, 0]))
+    single.attributes["color"] = "red"
+    single.geometry[0].update_default_face_attributes(color=Color.red())
+    model.add_element(name="single", element=single)
+    model.find_interactions(amin=0.1)
+    model.add_interaction(model.element_at(0), single)
+    return model
+
+
+def edges(model):
+    keys = list(model.elements)
+    result = []
+    for u, neighbours in model.interactions.edge.items():
+        for v, data in neighbours.items():
+            joints = [(joint.frame.point, joint.polygon.points) for joint in data.get("joints") or []]
+            polygons = [polygon.points for polygon in data.get("geometry") or []]
+            result.append((keys.index(u), keys.index(v), round(data["weight"], 9), data.get("faces"), polygons, joints))
+    return sorted(result, key=lambda edge: edge[:2])
+
+
+def hierarchy(model):
+    keys = list(model.elements)
+    result = []
+    for node in model.hierarchy.root.traverse():
+        element = getattr(node, "element", None)
+        parent = node.parent.name if node.parent is not None else None
+        result.append((type(node).__name__, node.name, parent, keys.index(str(element.guid)) if element else None))
+    return result
+
+
+def test_npz_round_trip(model, tmp_path):
+    filepath = str(tmp_path / "model.npz")
+    model.to_npz(filepath)
+    other = Model.from_npz(filepath)
+
+    assert other.name == model.name
+    assert list(other.elements) == list(model.elements)
+    assert other.number_of_edges == model.number_of_edges > 0
+    assert edges(other) == edges(model)
+    assert hierarchy(other) == hierarchy(model)
+    assert other.find_node("sub").attributes == {"level": 1}
+
+
+def test_npz_counters(model, tmp_path):
+    filepath = str(tmp_path / "model.npz")
+    model.to_npz(filepath)
+    other = Model.from_npz(filepath)
+
+    assert other.number_of_nodes == model.number_of_nodes
+    assert other.hierarchy.number_of_elements == model.hierarchy.number_of_elements == len(model.elements)
+    for name in ("blocks", "sub"):
+        node, copy = model.find_node(name), other.find_node(name)
+        assert (copy._number_of_nodes, copy._number_of_elements) == (node._number_of_nodes, node._number_of_elements)
+
+
+def test_npz_elements(model, tmp_path):
+    filepath = str(tmp_path / "model.npz")
+    model.to_npz(filepath)
+    other = Model.from_npz(filepath)
+
+    for element, copy in zip(model.elements.values(), other.elements.values()):
+        assert copy.frame == element.frame
+        assert copy.attributes == element.attributes
+        assert copy.geometry[0].to_vertices_and_faces() == element.geometry[0].to_vertices_and_faces()
+    single = other.element_at(-1)
+    assert single.geometry[0].face_attribute(0, "color") == Color.red()
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+from compas.geometry import Frame
+
+from compas_assembly2 import BVH
+from compas_assembly2 import Algorithms
+from compas_assembly2 import Element
+
+
+@pytest.fixture
+def elements():
+    """Random rotated boxes of different sizes, touching and overlapping, and one large slab through the lowest."""
+    random.seed(2)
+    elements = []
+    for _ in range(120):
+        point = [random.uniform(0, 8), random.uniform(0, 8), random.uniform(0, 3)]
+        xaxis = [random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(-1, 1)]
+        yaxis = [random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(-1, 1)]
+        size = random.uniform(0.3, 1.2)
+        elements.append(Element.from_frame(size, size * 0.5, size * 0.8, Frame(point, xaxis, yaxis)))
+    elements.append(Element.from_frame(20, 0.5, 20, Frame([-16, 4, 0], [1, 0, 0], [0, 1, 0])))
+    Algorithms.inflate_bounding_boxes(elements, 0.01)
+    return elements
+
+
+def brute_force(elements):
+    pairs = []
+    for i in range(len(elements)):
+        for j in range(i + 1, len(elements)):
+            if elements[i].has_collision(elements[j]):
+                pairs.append((i, j))
+    return pairs
+
+
+def as_pairs(pairs):
+    return sorted((min(i, j), max(i, j)) for i, j in pairs)
+
+
+def test_sort_and_sweep(elements):
+    assert as_pairs(Algorithms.get_collision_pairs(elements)) == brute_force(elements)
+
+
+def test_kdtree_radius(elements):
+    expected = brute_force(elements)
+    assert as_pairs(Algorithms.get_collision_pairs_kdtree_radius(elements)) == expected
+    assert as_pairs(Algorithms.get_collision_pairs_kdtree(elements, max_neighbours=None)) == expected
+
+
+def test_grid(elements):
+    assert as_pairs(Algorithms.get_collision_pairs_grid(elements)) == brute_force(elements)
+
+
+def test_bvh(elements):
+    bvh = BVH.from_boxes([str(e.guid) for e in elements], [e.aabb() for e in elements])
+    assert as_pairs(Algorithms.get_collision_pairs_bvh(elements, bvh)) == brute_force(elements)
+
+
+def test_bvh_of_subset(elements):
+    bvh = BVH.from_boxes([str(e.guid) for e in elements], [e.aabb() for e in elements])
+    subset = list(range(0, len(elements), 7)) + [len(elements) - 1]
+    expected = [pair for pair in brute_force(elements) if pair[0] in subset or pair[1] in subset]
+    assert as_pairs(Algorithms.get_collision_pairs_bvh_of(elements, bvh, subset)) == expected
+
+
+def test_attributes(elements):
+    attributes = [i % 3 for i in range(len(elements))]
+    expected = [(i, j) for i, j in brute_force(elements) if attributes[i] != attributes[j]]
+    assert as_pairs(Algorithms.get_collision_pairs_with_attributes(elements, attributes)) == expected
+    assert as_pairs(Algorithms.get_collision_pairs_kdtree_radius(elements, True, attributes)) == expected
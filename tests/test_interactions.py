@@ -0,0 +1,61 @@
+import pytest
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from compas_assembly2 import Element
+from compas_assembly2 import Model
+
+
+def build():
+    """Touching unit cubes in a 4 x 3 grid and one cube apart from them."""
+    model = Model()
+    for i in range(4):
+        for j in range(3):
+            model.add_element(element=Element.from_frame(1, 1, 1, Frame([i, j, 0], [1, 0, 0], [0, 1, 0])))
+    model.add_element(element=Element.from_frame(1, 1, 1, Frame([0, 0, 5], [1, 0, 0], [0, 1, 0])))
+    return model
+
+
+def move(model):
+    # one cube leaves the grid, one is stacked on the single cube
+    model.element_at(5).transform(Translation.from_vector([0, 0, 10]))
+    model.element_at(11).transform(Translation.from_vector([-3, -2, 6]))
+
+
+def edges(model):
+    keys = list(model.elements)
+    result = []
+    for u, v in model.interactions.edges():
+        data = model.interactions.edge[u][v]
+        result.append((min(keys.index(u), keys.index(v)), max(keys.index(u), keys.index(v)), len(data["geometry"])))
+    return sorted(result)
+
+
+@pytest.fixture
+def expected():
+    model = build()
+    move(model)
+    model.find_interactions(amin=0.1)
+    return edges(model)
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_detection_after_move(expected, incremental):
+    model = build()
+    model.find_interactions(amin=0.1)
+    before = edges(model)
+    move(model)
+    assert model.dirty_elements() == [model.element_at(5), model.element_at(11)]
+    model.find_interactions(amin=0.1, incremental=incremental)
+    assert edges(model) == expected != before
+    assert model.dirty_elements() == []
+
+
+def test_detection_is_idempotent():
+    model = build()
+    model.find_interactions(amin=0.1)
+    first = edges(model)
+    model.find_interactions(amin=0.1)
+    model.find_interactions(amin=0.1, incremental=True)
+    assert edges(model) == first
+    assert len(first) == 4 * 2 + 3 * 3
@@ -0,0 +1,125 @@
+import random
+
+import pytest
+from compas.geometry import Translation
+
+from compas_assembly2 import BVH
+from compas_assembly2 import Element
+from compas_assembly2 import Model
+from compas_assembly2 import SpatialHash
+
+
+def random_box(size=10.0):
+    x, y, z = random.uniform(0, size), random.uniform(0, size), random.uniform(0, size)
+    dx, dy, dz = random.uniform(0.1, 2.0), random.uniform(0.1, 2.0), random.uniform(0.1, 2.0)
+    return [x, y, z, x + dx, y + dy, z + dz]
+
+
+def overlaps(a, b):
+    return all(a[i] <= b[i + 3] and b[i] <= a[i + 3] for i in range(3))
+
+
+def brute_force_query(boxes, box):
+    return sorted(key for key, other in boxes.items() if overlaps(other, box))
+
+
+def brute_force_pairs(boxes):
+    keys = sorted(boxes)
+    pairs = []
+    for i, a in enumerate(keys):
+        for b in keys[i + 1 :]:  # noqa: E203
+            if overlaps(boxes[a], boxes[b]):
+                pairs.append((a, b))
+    return pairs
+
+
+def as_pairs(pairs):
+    return sorted((min(a, b), max(a, b)) for a, b in pairs)
+
+
+@pytest.fixture
+def boxes():
+    random.seed(5)
+    return {key: random_box() for key in range(80)}
+
+
+def edit(index, boxes):
+    """Insert, remove, and move boxes in the index and in the reference dictionary."""
+    for key in range(80, 100):
+        boxes[key] = random_box()
+        index.insert(key, boxes[key])
+    for key in range(0, 100, 4):
+        index.remove(key)
+        del boxes[key]
+    for key in range(1, 100, 4):
+        if key in boxes:
+            boxes[key] = random_box()
+            if isinstance(index, BVH):
+                index.update(key, boxes[key])
+            else:
+                index.remove(key)
+                index.insert(key, boxes[key])
+    # a removed key inserted again gets a new insertion order
+    boxes[0] = random_box()
+    index.insert(0, boxes[0])
+
+
+def check(index, boxes):
+    assert len(index) == len(boxes)
+    assert as_pairs(index.query_pairs()) == brute_force_pairs(boxes)
+    for _ in range(20):
+        box = random_box()
+        assert sorted(index.query_box(box)) == brute_force_query(boxes, box)
+
+
+def test_bvh_queries(boxes):
+    bvh = BVH.from_boxes(list(boxes.keys()), list(boxes.values()))
+    check(bvh, boxes)
+
+
+def test_bvh_insert_remove_update(boxes):
+    bvh = BVH()
+    for key, box in boxes.items():
+        bvh.insert(key, box)
+    edit(bvh, boxes)
+    check(bvh, boxes)
+
+
+def test_bvh_refit(boxes):
+    bvh = BVH.from_boxes(list(boxes.keys()), list(boxes.values()))
+    for key in boxes:
+        boxes[key] = random_box()
+    bvh.refit(boxes)
+    check(bvh, boxes)
+
+
+def test_bvh_query_order(boxes):
+    bvh = BVH.from_boxes(list(boxes.keys()), list(boxes.values()))
+    bvh.remove(3)
+    bvh.insert(3, boxes[3])
+    bvh.insert(200, [-100, -100, -100, 100, 100, 100])
+    keys = bvh.query_box([-100, -100, -100, 100, 100, 100])
+    assert keys[-2:] == [3, 200]
+
+
+def test_spatial_hash(boxes):
+    grid = SpatialHash(cell_size=1.5)
+    for key, box in boxes.items():
+        grid.insert(key, box)
+    check(grid, boxes)
+    edit(grid, boxes)
+    check(grid, boxes)
+
+
+def test_model_bvh_follows_transformed_elements():
+    model = Model()
+    elements = [Element.from_frame(1, 1, 1) for _ in range(3)]
+    for element in elements:
+        model.add_element(element=element)
+    bvh = model.bvh
+    moved = elements[1]
+    moved.transform(Translation.from_vector([50, 0, 0]))
+    assert model.bvh is bvh
+    found = bvh.query_box(moved.aabb())
+    assert found == [str(moved.guid)]
+    assert str(moved.guid) not in model.bvh.query_box(elements[0].aabb())
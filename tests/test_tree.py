@@ -0,0 +1,86 @@
+import pytest
+
+from compas_assembly2 import Element
+from compas_assembly2 import ElementNode
+from compas_assembly2 import GroupNode
+from compas_assembly2 import Model
+
+
+def build():
+    model = Model()
+    a = model.add_group("a")
+    b = a.add_group("b")
+    c = b.add_group("c")
+    for group in (a, b, c, c):
+        group.add_element(element=Element.from_frame(1, 1, 1))
+    model.add_element(element=Element.from_frame(1, 1, 1))
+    return model
+
+
+def check(model):
+    """Compare the counters and the lookup tables of the tree with a full traversal."""
+    tree = model.hierarchy
+    for group in tree.traverse(node_type=GroupNode):
+        nodes = list(group.traverse())[1:]
+        assert group.number_of_nodes == len(nodes)
+        assert group.number_of_elements == sum(isinstance(node, ElementNode) for node in nodes)
+
+    element_nodes = [node for node in tree.traverse() if isinstance(node, ElementNode)]
+    assert tree.number_of_elements == len(element_nodes) == len(model.elements)
+    assert model.number_of_nodes == len(list(tree.traverse())) - 1
+    for node in tree.traverse():
+        assert node.tree is tree
+        if isinstance(node, ElementNode):
+            assert tree.get_element_node(node.element.guid) is node
+            assert str(node.element.guid) in model.elements
+            assert model[node.element] is node.parent
+
+
+def test_build():
+    check(build())
+
+
+def test_graft():
+    model = build()
+    model.graft()
+    check(model)
+
+
+def test_merge():
+    model, other = build(), build()
+    guids = list(other.elements)
+    model.merge(other)
+    check(model)
+    assert all(guid in model.elements for guid in guids)
+    assert model.hierarchy.number_of_elements == 10
+
+
+def test_set_child_by_index():
+    model = build()
+    removed = [node.element for node in model.hierarchy.root.children[0].traverse() if isinstance(node, ElementNode)]
+    group = GroupNode(name="new")
+    sub = group.add_group("sub")
+    group.add_element(element=Element.from_frame(1, 1, 1))
+    model.set_child_by_index(0, group)
+    check(model)
+
+    # the new subtree belongs to the tree, elements added later are indexed
+    element = Element.from_frame(1, 1, 1)
+    model.find_node("sub").add_element(element=element)
+    assert sub.tree is model.hierarchy
+    assert model.hierarchy.get_element_node(element.guid) is not None
+    check(model)
+    for element in removed:
+        assert model.hierarchy.get_element_node(element.guid) is None
+
+
+@pytest.mark.parametrize("name", ["a", "b", "c"])
+def test_remove_group(name):
+    model = build()
+    node = model.find_node(name)
+    node.parent.remove(node)
+    assert node.tree is None
+    assert model.find_node(name) is None
+    for group in model.hierarchy.traverse(node_type=GroupNode):
+        nodes = list(group.traverse())[1:]
+        assert group.number_of_nodes == len(nodes)